@@ -0,0 +1,35 @@
+"""bot_config_response_cache
+
+Revision ID: 20261019104500
+Revises: 20250106150800
+Create Date: 2026-10-19 10:45:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019104500"
+down_revision: Union[str, None] = "20250106150800"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "bot_configs",
+        sa.Column(
+            "enable_response_cache",
+            sa.Boolean(),
+            server_default=sa.text("false"),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("bot_configs", "enable_response_cache")
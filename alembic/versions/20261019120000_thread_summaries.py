@@ -0,0 +1,63 @@
+"""thread_summaries
+
+Revision ID: 20261019120000
+Revises: 20261019104500
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019120000"
+down_revision: Union[str, None] = "20261019104500"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "thread_summaries",
+        sa.Column("thread_id", sa.UUID(), nullable=False),
+        sa.Column("bot_id", sa.UUID(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("first_message_id", sa.String(length=64), nullable=True),
+        sa.Column("last_message_id", sa.String(length=64), nullable=True),
+        sa.Column("message_count", sa.Integer(), nullable=True),
+        sa.Column("covered_tokens", sa.Integer(), nullable=True),
+        sa.Column("tenant_id", sa.UUID(), nullable=True),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_by", sa.UUID(), nullable=True),
+        sa.Column("updated_by", sa.UUID(), nullable=True),
+        sa.ForeignKeyConstraint(["bot_id"], ["bots.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("thread_id"),
+    )
+    op.create_index(
+        op.f("ix_thread_summaries_created_by"),
+        "thread_summaries",
+        ["created_by"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_thread_summaries_tenant_id"),
+        "thread_summaries",
+        ["tenant_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_thread_summaries_tenant_id"), table_name="thread_summaries")
+    op.drop_index(op.f("ix_thread_summaries_created_by"), table_name="thread_summaries")
+    op.drop_table("thread_summaries")
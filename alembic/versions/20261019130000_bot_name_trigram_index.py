@@ -0,0 +1,44 @@
+"""bot_name_trigram_index
+
+Revision ID: 20261019130000
+Revises: 20261019120000
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019130000"
+down_revision: Union[str, None] = "20261019120000"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CONCURRENTLY keeps bots writable while the index builds; it cannot
+    # run inside the migration's transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_bots_name_trgm",
+            "bots",
+            ["name"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_bots_name_trgm",
+            table_name="bots",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -1,7 +1,8 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from app.api.v1.endpoints.deps import CurrentUser, get_current_user
-from app.models.enums import StatusEnum
+from app.models.enums import CountModeEnum, StatusEnum
 from app.services.bot import BotService
 from app.schemas.bot import BotConfigCreate, BotConfigResponse, BotCreate, BotResponse
 from app.utils.response_handler import response
@@ -31,6 +32,8 @@ async def get_bots(
     current_user: CurrentUser = Depends(get_current_user),
     team_id: Optional[str] = Query(None),
     name: Optional[str] = Query(None),
+    count: CountModeEnum = Query(CountModeEnum.EXACT),
+    cursor: Optional[str] = Query(None),
 ):
     joins = []
     filters = {}
@@ -40,22 +43,37 @@ async def get_bots(
         filters["team_access.team_id"] = team_id
         joins.append("team_access")
 
-    search_fields = {"name": "contains"}
+    # Typo-tolerant, best matches first
+    search_fields = {"name": "trigram"}
     search_term = None
     if name:
         search_term = name
 
-    items, total = await service.get_bots(
+    page = await service.get_bots(
         skip=skip,
         limit=limit,
         filters=filters,
         joins=joins,
         search_term=search_term,
         search_fields=search_fields,
+        count_mode=count,
+        cursor=cursor,
     )
 
     return response.success(
-        data=items, message="Bots fetched successfully", meta={"total": total}
+        data=page.items, message="Bots fetched successfully", meta=page.meta()
+    )
+
+
+@router.get("/export")
+async def export_bots(
+    status: Optional[StatusEnum] = Query(None),
+    service: BotService = Depends(),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    filters = {"status": status} if status else {}
+    return StreamingResponse(
+        service.export_bots(filters), media_type="application/x-ndjson"
     )
 
 
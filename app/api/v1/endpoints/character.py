@@ -1,7 +1,7 @@
 from typing import Optional
 from fastapi import APIRouter, Depends, Query
 from app.api.v1.endpoints.deps import CurrentUser, get_current_user
-from app.models.enums import AccessLevelEnum, StatusEnum
+from app.models.enums import AccessLevelEnum, CountModeEnum, StatusEnum
 from app.services.bot import BotService
 from app.utils.response_handler import response
 from uuid import UUID
@@ -15,7 +15,10 @@ async def get_discovery_characters(
     limit: int = Query(10, ge=1),
     category_id: Optional[str] = Query(None),
     name: Optional[str] = Query(None),
+    q: Optional[str] = Query(None),
     team_id: Optional[str] = Query(None),
+    count: CountModeEnum = Query(CountModeEnum.EXACT),
+    cursor: Optional[str] = Query(None),
     current_user: CurrentUser = Depends(get_current_user),
 ):
     filters = {
@@ -37,16 +40,22 @@ async def get_discovery_characters(
     search_term = None
     if name:
         search_term = name
+    if q:
+        # Intent search over name, tagline and description, best matches first
+        search_fields = {"search_vector": "fulltext"}
+        search_term = q
     
-    items, total = await service.get_bots(
+    page = await service.get_bots(
         filters=filters,
         skip=skip,
         limit=limit,
         search_term=search_term,
         search_fields=search_fields,
-        joins=joins
+        joins=joins,
+        count_mode=count,
+        cursor=cursor
     )
-    return response.success(data=items, message="Character fetched successfully", meta={"total": total})
+    return response.success(data=page.items, message="Character fetched successfully", meta=page.meta())
 
 @router.get("/recents")
 async def get_recents_characters(
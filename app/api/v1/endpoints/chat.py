@@ -1,13 +1,19 @@
 import json
-from typing import Any
+from typing import Any, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends
-from app.api.v1.endpoints.deps import CurrentUser, get_current_user
+from fastapi import APIRouter, Depends, Header, Query, WebSocket, status
+from app.api.v1.endpoints.deps import (
+    CurrentUser,
+    get_current_user,
+    get_websocket_user,
+)
 from app.schemas.chat import CreateMessageRequest, CreateThreadRequest
-from app.services.conversation_service import ConversationService
+from app.services.chat_socket import ChatSocketSession
+from app.services.conversation_service import ConversationService, schedule_prefetch
 from app.utils.http_client import NexusClient
 from app.utils.response_handler import response
 from sse_starlette import EventSourceResponse
+from app.core.config import settings
 from app.core.exceptions import APIError
 
 router = APIRouter()
@@ -21,25 +27,83 @@ async def create_user_message(
     bot_id: UUID,
     thread_id: UUID,
     schema: CreateMessageRequest,
+    stream: bool = Query(True),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
     current_user: CurrentUser = Depends(get_current_user),
     service: ConversationService = Depends(),
 ):
+    if not stream:
+        # Server-to-server callers get the whole reply as a regular JSON response
+        message = await service.process_user_message(
+            bot_id=bot_id,
+            thread_id=thread_id,
+            schema=schema,
+            stream=False,
+        )
+        res = response.success(data=message, message="Message created successfully")
+        res.headers.update(_server_timing(service))
+        return res
+
+    # Preflight and admission run before the response starts, so errors such
+    # as 402 or 429 reach the client with their real status code.
     try:
+        stream_iterator = await service.process_user_message(
+            bot_id=bot_id,
+            thread_id=thread_id,
+            schema=schema,
+            stream=True,
+            last_event_id=last_event_id,
+        )
+    except APIError:
+        raise
+    except Exception as e:
+        raise APIError(message=str(e), status_code=500)
 
-        async def event_generator():
-            stream_iterator = await service.process_user_message(
-                bot_id=bot_id,
-                thread_id=thread_id,
-                schema=schema,
-                stream=True,
-            )
+    # The response id lets the client resume with Last-Event-ID after a drop
+    headers = {"X-Response-Id": schema.response_id, **_server_timing(service)}
+    return EventSourceResponse(stream_iterator, headers=headers)
 
-            async for token in stream_iterator:
-                yield token
 
-        return EventSourceResponse(event_generator())
-    except Exception as e:
-        raise APIError(message=str(e), status_code=500)
+def _server_timing(service: ConversationService) -> dict:
+    """Stages measured before the response starts, when enabled"""
+    if not settings.CHAT_SERVER_TIMING or service.timer is None:
+        return {}
+    value = service.timer.server_timing()
+    return {"Server-Timing": value} if value else {}
+
+
+@router.websocket("/ws")
+async def chat_socket(websocket: WebSocket):
+    """
+    Multiplexed chat transport: authenticated once, then any number of
+    `message` / `resume` / `cancel` frames, answered with events tagged by
+    the assistant message id.
+    """
+    try:
+        await get_websocket_user(websocket)
+    except APIError as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=e.message)
+        return
+
+    await websocket.accept()
+    await ChatSocketSession(
+        websocket,
+        max_streams=settings.CHAT_SOCKET_MAX_STREAMS,
+        send_queue_size=settings.CHAT_SOCKET_SEND_QUEUE_SIZE,
+    ).run()
+
+
+@router.get("/{bot_id}/thread/{thread_id}/messages/{message_id}/stream")
+async def resume_message_stream(
+    bot_id: UUID,
+    thread_id: UUID,
+    message_id: str,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    current_user: CurrentUser = Depends(get_current_user),
+    service: ConversationService = Depends(),
+):
+    stream_iterator = service.resume_stream(thread_id, message_id, last_event_id)
+    return EventSourceResponse(stream_iterator)
 
 
 @router.get("/{bot_id}/thread/{thread_id}/messages")
@@ -51,6 +115,10 @@ async def get_messages(
     nexus_client: NexusClient = Depends(),
     current_user: CurrentUser = Depends(get_current_user),
 ):
+    if skip == 0:
+        # Opening a thread usually precedes a new message
+        schedule_prefetch(bot_id, thread_id)
+
     messages = await nexus_client.get(
         f"api/v1/messages/{thread_id}",
         params={"skip": skip, "limit": limit, "group_by": str(bot_id)},
@@ -92,6 +160,7 @@ async def get_thread(
     nexus_client: NexusClient = Depends(),
     current_user: CurrentUser = Depends(get_current_user),
 ):
+    schedule_prefetch(bot_id, thread_id)
     res = await nexus_client.get(f"api/v1/threads/{thread_id}")
     item = res.json()
     return response.success(data=item.get("data"))
@@ -1,7 +1,10 @@
+import secrets
 from typing import Optional, Tuple
-from fastapi import Depends, Header, Request, status
+from fastapi import Depends, Header, Request, WebSocket, status
+from starlette.requests import HTTPConnection
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import BaseModel
+from app.core.config import settings
 from app.core.exceptions import APIError
 from app.models.base import (
     current_user_id,
@@ -24,7 +27,8 @@ class CurrentUser(BaseModel):
 
 
 async def _validate_permission(
-    request: Request,
+    request: HTTPConnection,
+    token: Optional[str] = None,
 ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
     """
     Validate bearer token and extract user/tenant IDs.
@@ -32,13 +36,14 @@ async def _validate_permission(
     """
 
     client = FuryClient()
-    token = request.headers.get("Authorization", "")
+    token = token or request.headers.get("Authorization", "")
     response = await client.get(
         f"api/v1/rbac/validate-permission",
         headers={
             "Authorization": token,
             "X-Original-URI": request.url.path,
-            "X-Original-Method": request.method,
+            # WebSocket handshakes are GET requests
+            "X-Original-Method": getattr(request, "method", "GET"),
             "X-Original-Host": request.url.hostname,
             "X-Api-Key": request.headers.get("X-Api-Key", ""),
         },
@@ -89,3 +94,40 @@ async def get_current_user(
     except Exception as e:
         logger.error(f"Error getting current user: {e}")
         raise APIError(message="Internal server error", status_code=500)
+
+
+async def verify_metrics_token(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> None:
+    """
+    Metrics labels name tenants and bots, so they are only served to holders
+    of the internal METRICS_TOKEN, and not at all when none is configured.
+    """
+    if not settings.METRICS_TOKEN:
+        raise APIError(message="Not found", status_code=status.HTTP_404_NOT_FOUND)
+    if credentials is None or not secrets.compare_digest(
+        credentials.credentials, settings.METRICS_TOKEN
+    ):
+        raise APIError(message="Unauthorized", status_code=status.HTTP_401_UNAUTHORIZED)
+
+
+async def get_websocket_user(websocket: WebSocket) -> CurrentUser:
+    """
+    Validate a WebSocket handshake once for the whole connection. Browsers
+    cannot set headers on WebSockets, so the bearer token may also be passed
+    as the `token` query parameter.
+    """
+    token = websocket.headers.get("Authorization")
+    if not token and websocket.query_params.get("token"):
+        token = f"Bearer {websocket.query_params['token']}"
+
+    try:
+        user_id, tenant_id, project_id = await _validate_permission(websocket, token)
+        return CurrentUser(id=user_id, tenant_id=tenant_id, project_id=project_id)
+
+    except APIError as e:
+        raise e
+
+    except Exception as e:
+        logger.error(f"Error getting current websocket user: {e}")
+        raise APIError(message="Internal server error", status_code=500)
@@ -1,5 +1,6 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, Query
+from app.models.enums import CountModeEnum
 from app.services.master import MasterService
 from app.schemas.master import MstCategoryBase, MstItemBase
 from app.utils.response_handler import response
@@ -53,13 +54,17 @@ async def get_mst_category(
 async def get_mst_categories(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1),
+    count: CountModeEnum = Query(CountModeEnum.EXACT),
+    cursor: Optional[str] = Query(None),
     service: MasterService = Depends(),
 ):
-    items, total = await service.get_mst_categories(skip, limit)
+    page = await service.get_mst_categories(
+        skip, limit, count_mode=count, cursor=cursor
+    )
     return response.success(
-        data=items,
+        data=page.items,
         message="MstCategories fetched successfully",
-        meta={"total": total},
+        meta=page.meta(),
     )
 
 
@@ -131,11 +136,15 @@ async def get_mst_items(
     slug: str,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1),
+    count: CountModeEnum = Query(CountModeEnum.EXACT),
+    cursor: Optional[str] = Query(None),
     service: MasterService = Depends(),
 ):
-    items, total = await service.get_mst_items(slug, skip, limit)
+    page = await service.get_mst_items(
+        slug, skip, limit, count_mode=count, cursor=cursor
+    )
     return response.success(
-        data=items,
+        data=page.items,
         message="MstItems fetched successfully",
-        meta={"total": total},
+        meta=page.meta(),
     )
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 class Settings(BaseSettings):
@@ -33,6 +33,65 @@ class Settings(BaseSettings):
     BBPROXY_LLM_URL: str = ""
     BBPROXY_API_KEY: str = ""
 
+    # LLM Gateway
+    LLM_BASE_URL: Optional[str] = None
+    LLM_CLIENT_POOL_SIZE: int = 100
+
+    # Chat response cache for bots with enable_response_cache
+    RESPONSE_CACHE_TTL: int = 3600
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+
+    # Chat stream admission control
+    STREAM_MAX_CONCURRENT: int = 200
+    STREAM_MAX_PER_TENANT: int = 20
+    STREAM_MAX_PER_PROJECT: int = 10
+    STREAM_MAX_QUEUE_PER_TENANT: int = 50
+    STREAM_MAX_WAIT_SECONDS: float = 10.0
+    STREAM_TENANT_WEIGHTS: Dict[str, float] = {}
+
+    # Resumable chat streams (Last-Event-ID)
+    STREAM_BUFFER_MAX_EVENTS: int = 2048
+    STREAM_BUFFER_MAX_STREAMS: int = 1000
+    STREAM_BUFFER_RETENTION_SECONDS: float = 60.0
+    STREAM_RESUME_GRACE_SECONDS: float = 10.0
+
+    # Idempotent message submission (thread_id, message id)
+    IDEMPOTENCY_TTL_SECONDS: float = 3600.0
+    IDEMPOTENCY_MAX_ENTRIES: int = 10000
+    IDEMPOTENCY_WAIT_SECONDS: float = 120.0
+
+    # Speculative preflight prefetch when a thread is opened
+    PREFETCH_ENABLED: bool = True
+    PREFETCH_TTL_SECONDS: float = 15.0
+    PREFETCH_MAX_BYTES: int = 16 * 1024 * 1024
+
+    # Rolling summaries of long threads
+    SUMMARY_ENABLED: bool = True
+    SUMMARY_TRIGGER_TOKENS: int = 3000
+    SUMMARY_KEEP_RECENT_MESSAGES: int = 6
+    SUMMARY_SCAN_LIMIT: int = 100
+    SUMMARY_MAX_CONCURRENT: int = 4
+
+    # Chat WebSocket transport, per connection
+    CHAT_SOCKET_MAX_STREAMS: int = 8
+    CHAT_SOCKET_SEND_QUEUE_SIZE: int = 256
+
+    # Estimated list totals (count=estimate); smaller results are counted exactly
+    COUNT_ESTIMATE_THRESHOLD: int = 10000
+
+    # Read replicas for repository reads of GET requests (JSON list of URLs)
+    DATABASE_REPLICA_URLS: List[str] = []
+    REPLICA_STICKY_SECONDS: float = 5.0
+    REPLICA_MAX_LAG_SECONDS: float = 2.0
+    REPLICA_LAG_CHECK_SECONDS: float = 1.0
+    REPLICA_RETRY_SECONDS: float = 30.0
+
+    # Internal /metrics endpoint (bearer token; disabled when unset)
+    METRICS_TOKEN: Optional[str] = None
+
+    # Per-request stage timings in a Server-Timing response header
+    CHAT_SERVER_TIMING: bool = False
+
     # API Key Encryption Configuration
     PUBLIC_KEY_PATH: Optional[str] = None
     PRIVATE_KEY_PATH: Optional[str] = None
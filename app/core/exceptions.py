@@ -9,11 +9,13 @@ class APIError(Exception):
         self,
         message: str,
         status_code: int = 400,
-        errors: list[Error] = None
+        errors: list[Error] = None,
+        headers: dict[str, str] = None
     ):
         self.message = message
         self.status_code = status_code
         self.errors = errors
+        self.headers = headers
         super().__init__(self.message)
 
 async def api_error_handler(request: Request, exc: APIError) -> JSONResponse:
@@ -25,7 +27,8 @@ async def api_error_handler(request: Request, exc: APIError) -> JSONResponse:
             "data": None,
             "meta": None,
             "errors": [error.model_dump() for error in exc.errors] if exc.errors else None
-        }
+        },
+        headers=exc.headers
     )
 
 async def validation_error_handler(request: Request, exc: RequestValidationError) -> JSONResponse:
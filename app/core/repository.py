@@ -1,20 +1,253 @@
 # app/core/repository.py
 
-from typing import Generic, TypeVar, Type, Optional, List, Any, Dict, Tuple, Union
+import json
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import lru_cache
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 from uuid import UUID
-from sqlalchemy import distinct, select, tuple_, update, delete, and_, or_, func
+from sqlalchemy import (
+    Integer,
+    String,
+    and_,
+    bindparam,
+    delete,
+    distinct,
+    exists,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload, load_only
-from sqlalchemy.sql import Select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import (
+    joinedload,
+    load_only,
+    raiseload,
+    selectinload,
+    subqueryload,
+)
+from sqlalchemy.sql import ClauseElement, Executable, Select
 from pydantic import BaseModel
+from app.core.config import settings
 from app.db.base import Base
 from app.core.exceptions import APIError
+from app.db.replicas import replicas
 from app.models.base import current_tenant_id, current_user_id
+from app.models.enums import CountModeEnum
+from app.utils.batch_loader import BatchLoader
+from app.utils.pagination import decode_cursor, encode_cursor
 
 ModelType = TypeVar("ModelType", bound=Base)  # type: ignore
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+LOADER_STRATEGIES = {
+    "joined": joinedload,
+    "selectin": selectinload,
+    "subquery": subqueryload,
+    "raise": raiseload,
+}
+
+# Search types whose matches are ordered by relevance to the search term
+RANKED_SEARCH_TYPES = ("trigram", "fulltext")
+
+# Text search configuration of full-text documents, e.g. Bot.search_vector
+TEXT_SEARCH_CONFIG = "english"
+
+FilterShape = Tuple[Tuple[str, str], ...]
+SearchShape = Tuple[Tuple[str, str], ...]
+Ordering = Tuple[Tuple[str, bool], ...]
+
+
+@lru_cache(maxsize=1024)
+def _resolve_attribute(model: Type[Base], path: str):
+    """Walk a dotted path such as "team_access.team_id" to its final attribute"""
+    parts = path.split(".")
+    current_model = model
+    for part in parts[:-1]:
+        current_model = getattr(current_model, part).property.mapper.class_
+    return getattr(current_model, parts[-1])
+
+
+@lru_cache(maxsize=1024)
+def _loader_options(model: Type[Base], load_options: Tuple[str, ...]) -> tuple:
+    """
+    Eager-loading options for relationship paths such as "configs.variables".
+    A path may end in ":joined", ":selectin", ":subquery" or ":raise";
+    relationships without one use selectin for collections and joined for
+    many-to-one, so loading collections never multiplies the parent rows.
+    """
+    strategies = {}
+    for option in load_options:
+        path, _, strategy = option.partition(":")
+        if strategy:
+            if strategy not in LOADER_STRATEGIES:
+                raise ValueError(f"Unknown loading strategy: {strategy}")
+            strategies[path] = strategy
+
+    options = []
+    for option in load_options:
+        parts = option.partition(":")[0].split(".")
+        current_model = model
+        loader = None
+        for i, part in enumerate(parts):
+            attr = getattr(current_model, part)
+            default = "selectin" if attr.property.uselist else "joined"
+            load = LOADER_STRATEGIES[strategies.get(".".join(parts[: i + 1]), default)]
+            loader = (
+                load(attr) if loader is None else getattr(loader, load.__name__)(attr)
+            )
+            # Update current_model to the related model for next iteration
+            current_model = attr.property.mapper.class_
+        options.append(loader)
+    return tuple(options)
+
+
+def _filter_shape(filters: Optional[Dict[str, Any]]) -> FilterShape:
+    # Sorted, so the same filter keys in any order share one plan
+    return tuple(
+        (key, "list" if isinstance(value, list) else "null" if value is None else "eq")
+        for key, value in sorted((filters or {}).items())
+    )
+
+
+def _search_shape(
+    search_fields: Optional[Dict[str, str]], search_term: Optional[str]
+) -> SearchShape:
+    if not (search_term and search_fields):
+        return ()
+    return tuple(search_fields.items())
+
+
+@lru_cache(maxsize=1024)
+def _ordering(model: Type[Base], order_by: Tuple[str, ...], tiebreak: bool) -> Ordering:
+    """
+    (field, descending) pairs. With `tiebreak`, `id` closes the ordering in
+    the direction of the last key so every row has a unique, stable position
+    (ids are uuid7, so on their own they order by creation time).
+    """
+    ordering = tuple((field.lstrip("-"), field.startswith("-")) for field in order_by)
+    if tiebreak and hasattr(model, "id") and "id" not in dict(ordering):
+        ordering += (("id", ordering[-1][1] if ordering else False),)
+    return ordering
+
+
+def _python_value(attr, value: Any) -> Any:
+    """Coerce a value (e.g. from JSON or a path) to the column's Python type"""
+    try:
+        python_type = attr.type.python_type
+    except NotImplementedError:
+        return value
+    if value is None or isinstance(value, python_type):
+        return value
+    if python_type in (datetime, date):
+        return python_type.fromisoformat(value)
+    return python_type(value)
+
+
+def _prefix_tsquery(term: str) -> str:
+    """'essay help' -> 'essay:* & help:*', so partly typed words match too"""
+    return " & ".join(f"{word}:*" for word in re.findall(r"\w+", term))
+
+
+def _param_name(key: str) -> str:
+    return "filter_" + key.replace(".", "__")
+
+
+class QueryPlanCache:
+    """
+    LRU of built statements keyed by query shape (model, joins, filter keys,
+    search fields, ordering, loader options...). Values travel as bind
+    parameters, so a reused statement skips rebuilding, keeps its memoized
+    SQLAlchemy cache key and hits the engine's compiled-statement cache.
+    """
+
+    def __init__(self, max_size: int = 512):
+        self.max_size = max_size
+        self._plans: "OrderedDict[tuple, Select]" = OrderedDict()
+
+    def get(self, key: tuple) -> Optional[Select]:
+        plan = self._plans.get(key)
+        if plan is not None:
+            self._plans.move_to_end(key)
+        return plan
+
+    def set(self, key: tuple, plan: Select) -> None:
+        self._plans[key] = plan
+        if len(self._plans) > self.max_size:
+            self._plans.popitem(last=False)
+
+    def clear(self) -> None:
+        self._plans.clear()
+        _resolve_attribute.cache_clear()
+        _loader_options.cache_clear()
+
+
+query_plans = QueryPlanCache()
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, keeping its bind parameters"""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+@dataclass
+class Page(Generic[ModelType]):
+    """
+    One page of `get_multi`. Unpacks as `(items, total)`; `total` is None
+    when the count was skipped, `has_more` (rows after this page) is always
+    known. The cursors continue after the last / before the first item.
+    """
+
+    items: List[ModelType]
+    total: Optional[int] = None
+    has_more: bool = False
+    estimated: bool = False
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+    def __iter__(self):
+        return iter((self.items, self.total))
+
+    def meta(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "has_more": self.has_more,
+            "estimated": self.estimated,
+            "next_cursor": self.next_cursor,
+            "prev_cursor": self.prev_cursor,
+        }
+
 
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """
@@ -61,7 +294,127 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             await self.db.rollback()
             raise APIError(f"Create operation failed: {str(e)}")
 
-    def _build_query(
+    @property
+    def loader(self) -> BatchLoader:
+        """The session's batch loader, shared by every repository on it"""
+        return BatchLoader.for_session(self.db)
+
+    async def load(self, id: Union[UUID, str]) -> Optional[ModelType]:
+        """
+        Get a record by id through the batch loader: concurrent loads share
+        one query and results are remembered for the rest of the request.
+        Use `get` for projections, eager loading or tenant scoping.
+        """
+        return await self.loader.load(self.model, _python_value(self.model.id, id))
+
+    def _audit_values(self, inserting: bool) -> Dict[str, Any]:
+        """
+        What the before_insert / before_update listeners would set; bulk
+        statements bypass mapper events, so they apply these themselves
+        """
+        values = {}
+        user_id = current_user_id.get()
+        if user_id and hasattr(self.model, "updated_by"):
+            values["updated_by"] = user_id
+            if inserting:
+                values["created_by"] = user_id
+        tenant_id = current_tenant_id.get()
+        if inserting and tenant_id and hasattr(self.model, "tenant_id"):
+            values["tenant_id"] = tenant_id
+        return values
+
+    async def create_many(
+        self, schemas: List[Union[CreateSchemaType, Dict[str, Any]]]
+    ) -> List[ModelType]:
+        """
+        Create records with batched multi-row INSERT ... RETURNING, in the
+        order given
+        """
+        if not schemas:
+            return []
+        try:
+            audit = self._audit_values(inserting=True)
+            rows = [{**self._get_model_data(schema), **audit} for schema in schemas]
+            result = await self.db.scalars(
+                insert(self.model).returning(self.model, sort_by_parameter_order=True),
+                rows,
+            )
+            return result.all()
+
+        except Exception as e:
+            await self.db.rollback()
+            raise APIError(f"Create operation failed: {str(e)}")
+
+    async def update_many(self, schemas: List[Dict[str, Any]]) -> None:
+        """
+        Update records by primary key in one executemany UPDATE; every row
+        carries its `id` and may set different columns. Instances already
+        loaded in the session are not refreshed.
+        """
+        if not schemas:
+            return
+        try:
+            audit = self._audit_values(inserting=False)
+            rows = [{**self._get_model_data(schema), **audit} for schema in schemas]
+            await self.db.execute(update(self.model), rows)
+            for row in rows:
+                self.loader.forget(self.model, row["id"])
+
+        except Exception as e:
+            await self.db.rollback()
+            raise APIError(f"Update operation failed: {str(e)}")
+
+    async def upsert_many(
+        self,
+        schemas: List[Union[CreateSchemaType, Dict[str, Any]]],
+        index_elements: List[str],
+        update_fields: Optional[List[str]] = None,
+    ) -> List[ModelType]:
+        """
+        Insert records, updating the existing row on a conflict over
+        `index_elements` (a unique index). `update_fields` defaults to every
+        given column except the conflict keys; an empty list leaves existing
+        rows untouched (DO NOTHING) and only inserted rows come back. Rows
+        come back in no particular order.
+        """
+        if not schemas:
+            return []
+        try:
+            audit = self._audit_values(inserting=True)
+            rows = [{**self._get_model_data(schema), **audit} for schema in schemas]
+            if update_fields is None:
+                update_fields = [
+                    key
+                    for key in dict.fromkeys(key for row in rows for key in row)
+                    if key not in index_elements
+                    and key not in ("id", "created_by", "tenant_id")
+                ]
+
+            stmt = pg_insert(self.model)
+            if update_fields:
+                set_ = {field: stmt.excluded[field] for field in update_fields}
+                if hasattr(self.model, "updated_at"):
+                    set_["updated_at"] = func.now()
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=index_elements, set_=set_
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+            # No sort_by_parameter_order: with ON CONFLICT it falls back to
+            # one statement per row
+            result = await self.db.scalars(
+                stmt.returning(self.model),
+                rows,
+                execution_options={"populate_existing": True},
+            )
+            self.loader.forget(self.model)
+            return result.all()
+
+        except Exception as e:
+            await self.db.rollback()
+            raise APIError(f"Upsert operation failed: {str(e)}")
+
+    def _query_plan(
         self,
         joins: List[str] = None,
         filters: Dict[str, Any] = None,
@@ -72,110 +425,270 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         select_fields: List[str] = None,
         is_tenant_scoped: bool = False,
         with_deleted: bool = False,
-    ) -> Select:
+        paginate: bool = False,
+        window_total: bool = False,
+        keyset: Optional[str] = None,
+    ) -> Tuple[Select, Dict[str, Any]]:
         """
-        Build a complex query with joins, filters, and eager loading
+        Cached statement for this query shape, plus the parameters to run it
+        with (values are never baked into the statement)
         """
-        # Start with base query
-        query = select(self.model)
+        filter_shape = _filter_shape(filters)
+        search_shape = _search_shape(search_fields, search_term)
+        tenant_scoped = self._tenant_scoped(is_tenant_scoped)
+        key = (
+            "select",
+            self.model,
+            tuple(joins or ()),
+            filter_shape,
+            search_shape,
+            tuple(order_by or ()),
+            tuple(load_options or ()),
+            tuple(select_fields or ()),
+            tenant_scoped,
+            with_deleted,
+            paginate,
+            window_total,
+            keyset,
+        )
+        query = query_plans.get(key)
+        if query is None:
+            query = self._plan_select(*key[2:])
+            query_plans.set(key, query)
+        return query, self._plan_params(filters, search_term, tenant_scoped)
 
+    def _plan_select(
+        self,
+        joins: Tuple[str, ...],
+        filter_shape: FilterShape,
+        search_shape: SearchShape,
+        order_by: Tuple[str, ...],
+        load_options: Tuple[str, ...],
+        select_fields: Tuple[str, ...],
+        tenant_scoped: bool,
+        with_deleted: bool,
+        paginate: bool,
+        window_total: bool,
+        keyset: Optional[str],
+    ) -> Select:
+        ordering = _ordering(self.model, order_by, paginate)
+        # The total over all matching rows, computed before LIMIT/OFFSET
+        columns = [func.count().over().label("total")] if window_total else []
         if select_fields:
-            # Convert field names to ORM attributes
-            orm_attrs = [getattr(self.model, field) for field in select_fields]
-            query = select(self.model).options(load_only(*orm_attrs))
+            # Convert field names to ORM attributes (sort keys feed the cursors)
+            fields = dict.fromkeys([*select_fields, *dict(ordering)])
+            orm_attrs = [getattr(self.model, field) for field in fields]
+            query = select(self.model, *columns).options(load_only(*orm_attrs))
         else:
-            query = select(self.model)
+            query = select(self.model, *columns)
 
         # Apply joins if specified
-        if joins:
-            for join in joins:
-                relationship = getattr(self.model, join)
-                query = query.join(relationship)
+        for join in joins:
+            query = query.join(getattr(self.model, join))
 
         # Apply eager loading options
         if load_options:
-            for option in load_options:
-                # Support nested relationships with dots
-                if "." in option:
-                    # Handle nested eager loading
-                    parts = option.split(".")
-                    current_model = self.model
-                    loader = None
-
-                    for part in parts:
-                        attr = getattr(current_model, part)
-                        if loader is None:
-                            loader = joinedload(attr)
-                        else:
-                            loader = loader.joinedload(attr)
-                        # Update current_model to the related model for next iteration
-                        current_model = attr.property.mapper.class_
-
-                    query = query.options(loader)
-                else:
-                    attr = getattr(self.model, option)
-                    query = query.options(joinedload(attr))
-        # Apply filters
-        if filters:
-            filter_conditions = []
-            for key, value in filters.items():
-                if "." in key:
-                    # Handle relationship filtering
-                    relation_path = key.split(".")
-                    current_model = self.model
-
-                    # Navigate through the relationships to get the final attribute
-                    for i, path in enumerate(relation_path):
-                        if i == len(relation_path) - 1:
-                            # Last item is the actual column
-                            filter_conditions.append(
-                                getattr(current_model, path) == value
-                            )
-                        else:
-                            # Get the relationship model
-                            current_model = getattr(
-                                current_model, path
-                            ).property.mapper.class_
-                else:
-                    if isinstance(value, list):
-                        filter_conditions.append(getattr(self.model, key).in_(value))
-                    else:
-                        filter_conditions.append(getattr(self.model, key) == value)
-
-            if filter_conditions:
-                query = query.where(and_(*filter_conditions))
-
-        # Apply search if specified
-        if search_term and search_fields:
+            query = query.options(*_loader_options(self.model, load_options))
+
+        conditions = self._plan_conditions(
+            filter_shape, search_shape, tenant_scoped, with_deleted
+        )
+        backward = keyset == "prev"
+        if keyset:
+            conditions.append(self._keyset_condition(ordering, backward))
+        if conditions:
+            query = query.where(and_(*conditions))
+
+        # Best matches first; the ordering only breaks ties between them
+        rank = self._search_rank(search_shape)
+        if rank is not None:
+            query = query.order_by(rank.desc())
+
+        # Apply ordering (reversed when paging backwards from a cursor)
+        for field, descending in ordering:
+            attr = getattr(self.model, field)
+            query = query.order_by(
+                attr.desc() if descending != backward else attr.asc()
+            )
+
+        if paginate:
+            query = query.offset(bindparam("offset", type_=Integer)).limit(
+                bindparam("limit", type_=Integer)
+            )
+        return query
+
+    def _keyset_condition(self, ordering: Ordering, backward: bool):
+        """Rows strictly after (or before) the cursor row in this ordering"""
+        columns = [getattr(self.model, field) for field, _ in ordering]
+        values = [
+            bindparam(f"cursor_{i}", type_=column.type)
+            for i, column in enumerate(columns)
+        ]
+        directions = {descending != backward for _, descending in ordering}
+        if len(directions) == 1:
+            # Uniform direction: a row comparison the index can seek to
+            if directions.pop():
+                return tuple_(*columns) < tuple_(*values)
+            return tuple_(*columns) > tuple_(*values)
+
+        clauses = []
+        for i, (_, descending) in enumerate(ordering):
+            ties = [column == value for column, value in zip(columns[:i], values[:i])]
+            if descending != backward:
+                clauses.append(and_(*ties, columns[i] < values[i]))
+            else:
+                clauses.append(and_(*ties, columns[i] > values[i]))
+        return or_(*clauses)
+
+    def _plan_conditions(
+        self,
+        filter_shape: FilterShape,
+        search_shape: SearchShape,
+        tenant_scoped: bool,
+        with_deleted: bool,
+    ) -> list:
+        """WHERE clauses of a plan, with bind parameters in place of values"""
+        conditions = []
+        for key, kind in filter_shape:
+            attr = _resolve_attribute(self.model, key)
+            if kind == "list":
+                conditions.append(attr.in_(bindparam(_param_name(key), expanding=True)))
+            elif kind == "null":
+                conditions.append(attr.is_(None))
+            else:
+                conditions.append(attr == bindparam(_param_name(key)))
+
+        if search_shape:
             search_conditions = []
-            for field, search_type in search_fields.items():
+            term = bindparam("search_term", type_=String)
+            pattern = bindparam("search_pattern", type_=String)
+            for field, search_type in search_shape:
                 if search_type == "exact":
-                    search_conditions.append(getattr(self.model, field) == search_term)
+                    search_conditions.append(getattr(self.model, field) == term)
                 elif search_type == "contains":
+                    search_conditions.append(getattr(self.model, field).ilike(pattern))
+                elif search_type == "trigram":
+                    # Similar (pg_trgm `%`) or containing the term, so typos
+                    # match too; a trigram GIN index serves both
+                    attr = getattr(self.model, field)
                     search_conditions.append(
-                        getattr(self.model, field).ilike(f"%{search_term}%")
+                        or_(attr.op("%")(term), attr.ilike(pattern))
+                    )
+                elif search_type == "fulltext":
+                    # `field` is a tsvector column with a GIN index
+                    search_conditions.append(
+                        getattr(self.model, field).bool_op("@@")(self._tsquery())
                     )
             if search_conditions:
-                query = query.where(or_(*search_conditions))
+                conditions.append(or_(*search_conditions))
 
-        # Apply ordering
-        if order_by:
-            for order_field in order_by:
-                direction = "desc" if order_field.startswith("-") else "asc"
-                field = order_field.lstrip("-")
-                query = query.order_by(getattr(getattr(self.model, field), direction)())
+        if tenant_scoped:
+            conditions.append(self.model.tenant_id == bindparam("tenant_id"))
+
+        if not with_deleted and self.has_soft_delete:
+            conditions.append(self.model.deleted_at.is_(None))
 
-        if (
+        return conditions
+
+    def _tsquery(self):
+        return func.to_tsquery(
+            literal_column(f"'{TEXT_SEARCH_CONFIG}'"),
+            bindparam("search_tsquery", type_=String),
+        )
+
+    def _search_rank(self, search_shape: SearchShape):
+        """Relevance of a row to the search term over the ranked search fields"""
+        term = bindparam("search_term", type_=String)
+        ranks = []
+        for field, search_type in search_shape:
+            attr = getattr(self.model, field)
+            if search_type == "trigram":
+                ranks.append(func.similarity(attr, term))
+            elif search_type == "fulltext":
+                # Cover density, honouring the document's setweight() weights
+                ranks.append(func.ts_rank_cd(attr, self._tsquery()))
+        if not ranks:
+            return None
+        return ranks[0] if len(ranks) == 1 else func.greatest(*ranks)
+
+    def _tenant_scoped(self, is_tenant_scoped: bool) -> bool:
+        return bool(
             is_tenant_scoped
             and hasattr(self.model, "tenant_id")
             and current_tenant_id.get()
-        ):
-            query = query.where(and_(self.model.tenant_id == current_tenant_id.get()))
+        )
 
-        if not with_deleted and self.has_soft_delete:
-            query = query.where(self.model.deleted_at.is_(None))
+    def _plan_params(
+        self,
+        filters: Optional[Dict[str, Any]],
+        search_term: Optional[str],
+        tenant_scoped: bool,
+    ) -> Dict[str, Any]:
+        params = {
+            _param_name(key): value
+            for key, value in (filters or {}).items()
+            if value is not None
+        }
+        if search_term:
+            params["search_term"] = search_term
+            params["search_pattern"] = f"%{search_term}%"
+            params["search_tsquery"] = _prefix_tsquery(search_term)
+        if tenant_scoped:
+            params["tenant_id"] = current_tenant_id.get()
+        return params
 
-        return query
+    def _build_query(
+        self,
+        joins: List[str] = None,
+        filters: Dict[str, Any] = None,
+        search_fields: Dict[str, str] = None,
+        search_term: str = None,
+        order_by: List[str] = None,
+        load_options: List[str] = None,
+        select_fields: List[str] = None,
+        is_tenant_scoped: bool = False,
+        with_deleted: bool = False,
+    ) -> Select:
+        """
+        Build a complex query with joins, filters, and eager loading
+        """
+        query, params = self._query_plan(
+            joins=joins,
+            filters=filters,
+            search_fields=search_fields,
+            search_term=search_term,
+            order_by=order_by,
+            load_options=load_options,
+            select_fields=select_fields,
+            is_tenant_scoped=is_tenant_scoped,
+            with_deleted=with_deleted,
+        )
+        return query.params(params) if params else query
+
+    async def _read(self, method: str, statement, params=None) -> Any:
+        """
+        Run a read statement with `method` ("execute" or "scalar") on a
+        replica when the request allows it, else or if that fails, on the
+        request's own session
+        """
+        reader = await replicas.reader(self.db)
+        if reader is not None:
+            try:
+                return await getattr(reader, method)(statement, params)
+            except (DBAPIError, OSError) as e:
+                await replicas.failed(self.db, e)
+        return await getattr(self.db, method)(statement, params)
+
+    async def _attach(self, items: List[ModelType]) -> List[ModelType]:
+        """
+        Entities a replica read, merged (with what they loaded, no query)
+        into the request session, so later refreshes, lazy loads and updates
+        go through it rather than the replica's
+        """
+        return [
+            item if item in self.db else await self.db.merge(item, load=False)
+            for item in items
+        ]
 
     async def get(
         self,
@@ -194,7 +707,9 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         if not id and not filters:
             raise ValueError("Either id or filters must be provided")
 
-        query = self._build_query(
+        if id:
+            filters = {**(filters or {}), "id": id}
+        query, params = self._query_plan(
             joins=joins,
             load_options=load_options,
             select_fields=select_fields,
@@ -202,10 +717,9 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             is_tenant_scoped=is_tenant_scoped,
             with_deleted=with_deleted,
         )
-        if id:
-            query = query.where(self.model.id == id)
-        result = await self.db.execute(query)
-        return result.unique().scalar_one_or_none()
+        result = await self._read("execute", query, params)
+        item = result.unique().scalar_one_or_none()
+        return (await self._attach([item]))[0] if item is not None else None
 
     async def get_multi(
         self,
@@ -221,12 +735,53 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         select_fields: List[str] = None,
         is_tenant_scoped: bool = False,
         with_deleted: bool = False,
-    ) -> Tuple[List[ModelType], int]:
+        count_mode: CountModeEnum = CountModeEnum.EXACT,
+        cursor: Optional[str] = None,
+    ) -> Page[ModelType]:
         """
-        Get multiple records with comprehensive querying options
+        Get multiple records with comprehensive querying options.
+
+        `count_mode` picks how the total is obtained: EXACT runs a separate
+        count query, WINDOW reads `count(*) OVER ()` from the page query (one
+        round trip; joins that fan out rows are counted per row), NONE skips
+        it and fetches one extra row to tell whether another page exists.
+        ESTIMATE reports the planner's row estimate (flagged `estimated`)
+        and counts exactly when that is below COUNT_ESTIMATE_THRESHOLD.
+
+        Pages are ordered by `order_by` plus `id`. Given a `cursor` from a
+        previous page, the page seeks past that row instead of using `skip`;
+        totals are then exact (a window total would only cover the rows
+        past the cursor). Ranked searches (RANKED_SEARCH_TYPES) order by
+        relevance first and page with `skip` only.
         """
+        ordering = _ordering(self.model, tuple(order_by or ()), True)
+        order_names = [("-" if desc else "") + field for field, desc in ordering]
+        ranked = any(
+            search_type in RANKED_SEARCH_TYPES
+            for _, search_type in _search_shape(search_fields, search_term)
+        )
+        keyset = None
+        if cursor:
+            if ranked:
+                raise APIError(
+                    status_code=400,
+                    message="Cursors are not supported for ranked searches",
+                )
+            values, backward = decode_cursor(cursor, order_names)
+            try:
+                values = [
+                    _python_value(getattr(self.model, field), value)
+                    for (field, _), value in zip(ordering, values)
+                ]
+            except (ValueError, TypeError, AttributeError):
+                # Well-formed, but not values of the ordering's columns
+                raise APIError(message="Invalid cursor", status_code=400)
+            keyset = "prev" if backward else "next"
+            skip = 0
+            if count_mode == CountModeEnum.WINDOW:
+                count_mode = CountModeEnum.EXACT
 
-        count_query = self._build_count_query(
+        count_args = dict(
             joins=joins,
             filters=filters,
             search_fields=search_fields,
@@ -234,30 +789,101 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             is_tenant_scoped=is_tenant_scoped,
             with_deleted=with_deleted,
         )
-        total = await self.db.scalar(count_query)
+        total, estimated = None, False
+        if count_mode == CountModeEnum.ESTIMATE:
+            total = await self._estimate_total(count_args)
+            estimated = (total or 0) >= settings.COUNT_ESTIMATE_THRESHOLD
+            if not estimated:
+                count_mode = CountModeEnum.EXACT
+        if count_mode == CountModeEnum.EXACT:
+            total = await self._read("scalar", *self._count_plan(**count_args))
 
         # Build query
-        query = self._build_query(
-            joins=joins,
-            filters=filters,
-            search_fields=search_fields,
-            search_term=search_term,
+        query, params = self._query_plan(
             order_by=order_by,
             load_options=load_options,
             select_fields=select_fields,
-            is_tenant_scoped=is_tenant_scoped,
-            with_deleted=with_deleted,
+            paginate=True,
+            window_total=count_mode == CountModeEnum.WINDOW,
+            keyset=keyset,
+            **count_args,
         )
 
-        # Apply pagination
-        query = query.offset(skip).limit(limit)
+        # Apply pagination (one extra row tells whether the seek goes on)
+        seek = keyset is not None or count_mode in (
+            CountModeEnum.NONE,
+            CountModeEnum.ESTIMATE,
+        )
+        params.update(offset=skip, limit=limit + 1 if seek else limit)
+        if keyset:
+            for i, value in enumerate(values):
+                params[f"cursor_{i}"] = value
 
         # Execute query
-        result = await self.db.execute(query)
+        result = await self._read("execute", query, params)
 
-        return result.unique().scalars().all(), total
+        if count_mode == CountModeEnum.WINDOW:
+            rows = result.unique().all()
+            items = [row[0] for row in rows]
+            if rows:
+                total = rows[0].total
+            elif skip:
+                # Past the last page there is no row to carry the total
+                total = await self._read("scalar", *self._count_plan(**count_args))
+            else:
+                total = 0
+        else:
+            items = list(result.unique().scalars().all())
+        items = await self._attach(items)
 
-    def _build_count_query(
+        more = len(items) > limit if seek else skip + len(items) < total
+        items = items[:limit]
+        if keyset == "prev":
+            items.reverse()
+            has_more, has_previous = True, more
+        else:
+            has_more, has_previous = more, keyset == "next" or skip > 0
+
+        def cursor_for(item, backward: bool) -> Optional[str]:
+            # Relevance is not part of what a cursor can seek on
+            if ranked:
+                return None
+            values = [getattr(item, field) for field, _ in ordering]
+            return encode_cursor(order_names, values, backward)
+
+        return Page(
+            items,
+            total,
+            has_more=has_more,
+            estimated=estimated,
+            next_cursor=cursor_for(items[-1], False) if items and has_more else None,
+            prev_cursor=cursor_for(items[0], True) if items and has_previous else None,
+        )
+
+    async def _estimate_total(self, count_args: Dict[str, Any]) -> Optional[int]:
+        """
+        Planner estimate of the matching rows: pg_class.reltuples for the
+        whole table, EXPLAIN's row estimate when anything narrows it down
+        """
+        query, params = self._count_plan(kind="estimate", **count_args)
+        if query.whereclause is None and not count_args["joins"]:
+            reltuples = await self._read(
+                "scalar",
+                text(
+                    "SELECT reltuples::bigint FROM pg_class "
+                    "WHERE oid = CAST(:table AS regclass)"
+                ),
+                {"table": self.model.__tablename__},
+            )
+            # -1 until the table has been vacuumed or analyzed
+            return reltuples if reltuples and reltuples > 0 else None
+
+        plan = await self._read("scalar", _Explain(query), params)
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def _count_plan(
         self,
         joins: List[str] = None,
         filters: Dict[str, Any] = None,
@@ -265,16 +891,51 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         search_term: str = None,
         is_tenant_scoped: bool = False,
         with_deleted: bool = False,
-    ) -> Select:
+        kind: str = "count",
+    ) -> Tuple[Select, Dict[str, Any]]:
         """
-        Build an optimized count query
+        Cached statement for this query shape, plus its parameters. `kind`
+        is "count" for the number of matching rows, "exists" for whether
+        there is any, or "estimate" for their keys, for EXPLAIN
         """
-        # Start with simple count query
+        filter_shape = _filter_shape(filters)
+        search_shape = _search_shape(search_fields, search_term)
+        tenant_scoped = self._tenant_scoped(is_tenant_scoped)
+        key = (
+            kind,
+            self.model,
+            tuple(joins or ()),
+            filter_shape,
+            search_shape,
+            tenant_scoped,
+            with_deleted,
+        )
+        query = query_plans.get(key)
+        if query is None:
+            query = self._plan_count(kind, *key[2:])
+            query_plans.set(key, query)
+        return query, self._plan_params(filters, search_term, tenant_scoped)
+
+    def _plan_count(
+        self,
+        kind: str,
+        joins: Tuple[str, ...],
+        filter_shape: FilterShape,
+        search_shape: SearchShape,
+        tenant_scoped: bool,
+        with_deleted: bool,
+    ) -> Select:
         # Check if model has an id column
         has_id = hasattr(self.model, "id")
 
         # Build appropriate count expression
-        if has_id:
+        if kind in ("estimate", "exists"):
+            # Only whether (or roughly how many) rows match matters
+            count_expr = literal_column("1")
+        elif not joins and not any("." in key for key, _ in filter_shape):
+            # Nothing can repeat a row, so no need to deduplicate keys
+            count_expr = func.count()
+        elif has_id:
             # For tables with id column
             count_expr = func.count(distinct(self.model.id))
         else:
@@ -299,65 +960,94 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 )
 
         # Start with optimized count query
-        query = select(count_expr)
+        query = select(count_expr).select_from(self.model)
 
         # Apply joins if specified
-        if joins:
-            for join in joins:
-                relationship = getattr(self.model, join)
-                query = query.join(relationship)
-
-        # Apply filters
-        if filters:
-            filter_conditions = []
-            for key, value in filters.items():
-                if "." in key:
-                    # Handle relationship filtering
-                    relation_path = key.split(".")
-                    current_model = self.model
-                    for i, path in enumerate(relation_path):
-                        if i == len(relation_path) - 1:
-                            filter_conditions.append(
-                                getattr(current_model, path) == value
-                            )
-                        else:
-                            current_model = getattr(
-                                current_model, path
-                            ).property.mapper.class_
-                else:
-                    if isinstance(value, list):
-                        filter_conditions.append(getattr(self.model, key).in_(value))
-                    else:
-                        filter_conditions.append(getattr(self.model, key) == value)
-
-            if filter_conditions:
-                query = query.where(and_(*filter_conditions))
-
-        # Apply search if specified
-        if search_term and search_fields:
-            search_conditions = []
-            for field, search_type in search_fields.items():
-                if search_type == "exact":
-                    search_conditions.append(getattr(self.model, field) == search_term)
-                elif search_type == "contains":
-                    search_conditions.append(
-                        getattr(self.model, field).ilike(f"%{search_term}%")
-                    )
-            if search_conditions:
-                query = query.where(or_(*search_conditions))
+        for join in joins:
+            query = query.join(getattr(self.model, join))
 
-        if (
-            is_tenant_scoped
-            and hasattr(self.model, "tenant_id")
-            and current_tenant_id.get()
-        ):
-            query = query.where(and_(self.model.tenant_id == current_tenant_id.get()))
+        conditions = self._plan_conditions(
+            filter_shape, search_shape, tenant_scoped, with_deleted
+        )
+        if conditions:
+            query = query.where(and_(*conditions))
 
-        if not with_deleted and self.has_soft_delete:
-            query = query.where(self.model.deleted_at.is_(None))
+        if kind == "exists":
+            # The database stops at the first matching row
+            query = select(exists(query.limit(1)))
 
         return query
 
+    def _build_count_query(
+        self,
+        joins: List[str] = None,
+        filters: Dict[str, Any] = None,
+        search_fields: Dict[str, str] = None,
+        search_term: str = None,
+        is_tenant_scoped: bool = False,
+        with_deleted: bool = False,
+    ) -> Select:
+        """
+        Build an optimized count query
+        """
+        query, params = self._count_plan(
+            joins=joins,
+            filters=filters,
+            search_fields=search_fields,
+            search_term=search_term,
+            is_tenant_scoped=is_tenant_scoped,
+            with_deleted=with_deleted,
+        )
+        return query.params(params) if params else query
+
+    async def stream(
+        self,
+        *,
+        batch_size: int = 500,
+        joins: List[str] = None,
+        filters: Dict[str, Any] = None,
+        search_fields: Dict[str, str] = None,
+        search_term: str = None,
+        order_by: List[str] = None,
+        load_options: List[str] = None,
+        columns: List[str] = None,
+        is_tenant_scoped: bool = False,
+        with_deleted: bool = False,
+    ) -> AsyncIterator[List[Any]]:
+        """
+        Every matching record, in batches of `batch_size` read from a
+        server-side cursor, so memory stays bounded however many rows match.
+        Yields entities, or plain rows of `columns` when given (relationships
+        are not loaded then). Eager loading must not join collections (the
+        default selectin loads them once per batch).
+
+        The session has to stay open, and run nothing else, until iteration
+        ends; a StreamingResponse outlives the request's session, so open
+        one inside the generator.
+        """
+        query, params = self._query_plan(
+            joins=joins,
+            filters=filters,
+            search_fields=search_fields,
+            search_term=search_term,
+            order_by=order_by,
+            load_options=None if columns else load_options,
+            is_tenant_scoped=is_tenant_scoped,
+            with_deleted=with_deleted,
+        )
+        if columns:
+            query = query.with_only_columns(
+                *(getattr(self.model, column) for column in columns)
+            )
+
+        result = await self.db.stream(
+            query.execution_options(yield_per=batch_size), params
+        )
+        if not columns:
+            result = result.scalars()
+        async for batch in result.partitions():
+            yield batch
+
     async def update(
         self,
         id: UUID,
@@ -388,6 +1078,7 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 await self.db.flush()
                 await self.db.refresh(updated_obj)
 
+            self.loader.forget(self.model, id)
             return updated_obj
 
         except Exception as e:
@@ -440,28 +1131,54 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 stmt = delete(self.model).where(and_(*conditions))
 
             result = await self.db.execute(stmt)
+            self.loader.forget(self.model, id if not filters else None)
             return result.rowcount > 0
 
         except Exception as e:
             await self.db.rollback()
             raise APIError(f"Delete operation failed: {str(e)}")
 
-    async def exists(self, filters: Dict[str, Any]) -> bool:
+    async def exists(
+        self,
+        filters: Dict[str, Any] = None,
+        joins: List[str] = None,
+        is_tenant_scoped: bool = False,
+        with_deleted: bool = False,
+    ) -> bool:
         """
-        Check if records exist with given filters
+        Whether any record matches the filters, as `SELECT EXISTS(...)`
         """
-        query = self._build_query(filters=filters)
-        result = await self.db.execute(
-            select(func.count()).select_from(query.subquery())
+        return await self._read(
+            "scalar",
+            *self._count_plan(
+                joins=joins,
+                filters=filters,
+                is_tenant_scoped=is_tenant_scoped,
+                with_deleted=with_deleted,
+                kind="exists",
+            ),
         )
-        return result.scalar() > 0
 
-    async def count(self, filters: Dict[str, Any] = None) -> int:
+    async def count(
+        self,
+        filters: Dict[str, Any] = None,
+        joins: List[str] = None,
+        search_fields: Dict[str, str] = None,
+        search_term: str = None,
+        is_tenant_scoped: bool = False,
+        with_deleted: bool = False,
+    ) -> int:
         """
         Count records with optional filters
         """
-        query = self._build_query(filters=filters)
-        result = await self.db.execute(
-            select(func.count()).select_from(query.subquery())
+        return await self._read(
+            "scalar",
+            *self._count_plan(
+                joins=joins,
+                filters=filters,
+                search_fields=search_fields,
+                search_term=search_term,
+                is_tenant_scoped=is_tenant_scoped,
+                with_deleted=with_deleted,
+            ),
         )
-        return result.scalar()
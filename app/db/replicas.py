@@ -0,0 +1,177 @@
+# app/db/replicas.py
+import itertools
+import time
+from collections import OrderedDict
+from typing import List, Optional
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.base import current_tenant_id
+
+replica_routing = metrics.counter(
+    "db_replica_routing_total",
+    "Repository reads of GET requests by where they ran "
+    "(replica) or why they stayed on the primary",
+    ["route"],
+)
+
+# Seconds the replica's replay is behind; 0 when it has replayed all it received
+LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+MAX_STICKY_TENANTS = 10000
+
+
+class Replica:
+    def __init__(self, url: str):
+        self.engine = create_async_engine(
+            url, echo=settings.ENVIRONMENT == "development"
+        )
+        self.sessions = sessionmaker(
+            self.engine, class_=AsyncSession, expire_on_commit=False
+        )
+        self.down_until = 0.0
+        self.lag = 0.0
+        self.lag_checked_at = float("-inf")
+
+    def usable(self, now: float) -> bool:
+        if now < self.down_until:
+            return False
+        # A lagging replica is skipped until its lag is due for a recheck
+        return (
+            self.lag <= settings.REPLICA_MAX_LAG_SECONDS
+            or now - self.lag_checked_at >= settings.REPLICA_LAG_CHECK_SECONDS
+        )
+
+
+class ReplicaRouter:
+    """
+    Sends repository reads of GET requests to read replicas.
+
+    A request stays on the primary once it has written, and so does its
+    tenant for REPLICA_STICKY_SECONDS after any write (per worker), so
+    users read their own writes. Replicas replaying further behind than
+    REPLICA_MAX_LAG_SECONDS, or that failed within REPLICA_RETRY_SECONDS,
+    are skipped; with none left, reads run on the primary.
+    """
+
+    def __init__(self, urls: List[str]):
+        self._replicas = [Replica(url) for url in urls]
+        self._turn = itertools.count()
+        self._tenant_writes: "OrderedDict[str, float]" = OrderedDict()
+
+    def wrote(self, session: Session) -> None:
+        session.info["wrote"] = True
+        tenant_id = current_tenant_id.get()
+        if tenant_id:
+            self._tenant_writes[tenant_id] = time.monotonic()
+            self._tenant_writes.move_to_end(tenant_id)
+            while len(self._tenant_writes) > MAX_STICKY_TENANTS:
+                self._tenant_writes.popitem(last=False)
+
+    def _sticky(self, db: AsyncSession) -> bool:
+        if db.info.get("wrote") or db.new or db.dirty or db.deleted:
+            return True
+        tenant_id = current_tenant_id.get()
+        wrote_at = self._tenant_writes.get(tenant_id) if tenant_id else None
+        return (
+            wrote_at is not None
+            and time.monotonic() - wrote_at < settings.REPLICA_STICKY_SECONDS
+        )
+
+    def _pick(self) -> Optional[Replica]:
+        now = time.monotonic()
+        start = next(self._turn)
+        for i in range(len(self._replicas)):
+            replica = self._replicas[(start + i) % len(self._replicas)]
+            if replica.usable(now):
+                return replica
+        return None
+
+    async def _caught_up(self, replica: Replica, session: AsyncSession) -> bool:
+        now = time.monotonic()
+        if now - replica.lag_checked_at >= settings.REPLICA_LAG_CHECK_SECONDS:
+            replica.lag_checked_at = now
+            # NULL when the server is not replaying at all
+            replica.lag = float(await session.scalar(LAG_QUERY) or 0)
+        return replica.lag <= settings.REPLICA_MAX_LAG_SECONDS
+
+    async def reader(self, db: AsyncSession) -> Optional[AsyncSession]:
+        """
+        The replica session a read on the request session `db` should use,
+        or None to read from `db` itself
+        """
+        if not self._replicas or not db.info.get("read_only"):
+            return None
+        if self._sticky(db):
+            replica_routing.inc(route="sticky")
+            return None
+
+        session = db.info.get("replica_session")
+        if session is None:
+            replica = self._pick()
+            if replica is None:
+                replica_routing.inc(route="unavailable")
+                return None
+            session = replica.sessions()
+            session.info["replica"] = replica
+            try:
+                caught_up = await self._caught_up(replica, session)
+            except (DBAPIError, OSError) as e:
+                await self._discard(session, e)
+                return None
+            if not caught_up:
+                await session.close()
+                replica_routing.inc(route="lagging")
+                return None
+            db.info["replica_session"] = session
+
+        replica_routing.inc(route="replica")
+        return session
+
+    async def failed(self, db: AsyncSession, error: Exception) -> None:
+        """A read on the request's replica session failed; it is retried on `db`"""
+        session = db.info.pop("replica_session", None)
+        if session is not None:
+            await self._discard(session, error)
+
+    async def _discard(self, session: AsyncSession, error: Exception) -> None:
+        replica_routing.inc(route="failed")
+        if isinstance(error, (OSError, InterfaceError, OperationalError)) or getattr(
+            error, "connection_invalidated", False
+        ):
+            replica = session.info["replica"]
+            replica.down_until = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+        try:
+            await session.close()
+        except (DBAPIError, OSError):
+            pass
+
+    async def close(self, db: AsyncSession) -> None:
+        session = db.info.pop("replica_session", None)
+        if session is not None:
+            await session.close()
+
+
+replicas = ReplicaRouter(settings.DATABASE_REPLICA_URLS)
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context) -> None:
+    replicas.wrote(session)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_execute(orm_execute_state) -> None:
+    # Bulk and statement-level writes do not flush
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        replicas.wrote(orm_execute_state.session)
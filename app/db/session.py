@@ -1,8 +1,10 @@
 # app/db/session.py
 from typing import AsyncGenerator
+from fastapi.requests import HTTPConnection
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.replicas import replicas
 
 engine = create_async_engine(
     settings.DATABASE_URL, echo=settings.ENVIRONMENT == "development"
@@ -10,8 +12,10 @@ engine = create_async_engine(
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+async def get_db(connection: HTTPConnection) -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
+        # Repository reads of GET requests may run on a replica
+        session.info["read_only"] = connection.scope.get("method") in ("GET", "HEAD")
         try:
             yield session
             await session.commit()
@@ -19,4 +23,5 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.rollback()
             raise
         finally:
+            await replicas.close(session)
             await session.close()
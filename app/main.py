@@ -1,4 +1,4 @@
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
@@ -11,6 +11,11 @@ from app.core.exceptions import (
     sqlalchemy_error_handler,
 )
 from app.api.v1.router import api_router
+from app.api.v1.endpoints.deps import verify_metrics_token
+from app.core.metrics import metrics
+from app.utils.background import cancel_background_tasks
+from app.utils.http_client import close_http_clients
+from app.utils.llm_client_pool import close_llm_clients
 from app.utils.response_handler import response
 from app.middleware.request_id import RequestIDMiddleware
 from app.middleware.audit import AuditLogMiddleware
@@ -59,6 +64,22 @@ def create_application() -> FastAPI:
             data={"status": "healthy"}, message="Service is healthy"
         )
 
+    # Expose in-process metrics of this worker (internal token only)
+    @application.get(
+        f"{settings.ROOT_PATH}/metrics",
+        dependencies=[Depends(verify_metrics_token)],
+    )
+    async def get_metrics():
+        return response.success(
+            data=metrics.snapshot(), message="Metrics fetched successfully"
+        )
+
+    @application.on_event("shutdown")
+    async def shutdown():
+        await cancel_background_tasks()
+        await close_llm_clients()
+        await close_http_clients()
+
     return application
 
 
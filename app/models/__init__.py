@@ -4,3 +4,4 @@ from .enums import *
 from .bot import *
 from .master import *
 from .seeder_version import *
+from .thread_summary import *
@@ -2,17 +2,19 @@
 
 from sqlalchemy import (
     Column,
+    Computed,
     Float,
     Integer,
     String,
     Boolean,
     ForeignKey,
+    Index,
     Text,
     Enum as SQLAlchemyEnum,
     UniqueConstraint,
 )
-from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.dialects.postgresql import JSONB
 
 from app.models.base import TenantSoftDeleteModel, BaseModel
@@ -35,12 +37,36 @@ class Bot(TenantSoftDeleteModel):
     access_level = Column(
         String(20), default=AccessLevelEnum.ORG_LEVEL.value, nullable=True
     )
+    # Weighted document for "fulltext" searches, kept up to date by Postgres;
+    # deferred so loading bots doesn't fetch it
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(tagline, '')), 'B') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'C')",
+                persisted=True,
+            ),
+        )
+    )
 
     # Relationships
     configs = relationship("BotConfig", back_populates="bot")
     category = relationship("MstItem", back_populates="bot_categories")
     team_access = relationship("TeamBotAccess", back_populates="bot")
 
+    # Trigram index for "trigram" and "contains" name searches (pg_trgm)
+    __table_args__ = (
+        Index(
+            "ix_bots_name_trgm",
+            name,
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index("ix_bots_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
 
 class BotConfig(BaseModel):
     __tablename__ = "bot_configs"
@@ -59,6 +85,9 @@ class BotConfig(BaseModel):
     temperature = Column(Float, default=0.7)  # e.g. 0.7
     top_p = Column(Float, default=1.0)  # e.g. 1.0
     top_k = Column(Integer, default=0)  # e.g. 0
+    enable_response_cache = Column(
+        Boolean, default=False, server_default="false", nullable=False
+    )  # if true and temperature is 0, identical conversations reuse the answer
 
     # Relationships
     bot_id = Column(UUID(as_uuid=True), ForeignKey("bots.id"))
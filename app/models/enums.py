@@ -11,4 +11,10 @@ class StatusEnum(str, enum.Enum):
 class AccessLevelEnum(str, enum.Enum):
     ORG_LEVEL = "ORG_LEVEL"  # Accessible organization-wide
     TEAM_LEVEL = "TEAM_LEVEL"  # Only accessible by specific teams
-    HYBRID = "HYBRID"  # Accessible at both levels
\ No newline at end of file
+    HYBRID = "HYBRID"  # Accessible at both levels
+
+class CountModeEnum(str, enum.Enum):
+    EXACT = "exact"  # Separate count(distinct id) query
+    WINDOW = "window"  # count(*) OVER () in the page query itself
+    NONE = "none"  # No total, only whether another page exists
+    ESTIMATE = "estimate"  # Planner estimate, exact below a threshold
@@ -0,0 +1,20 @@
+# app/models/thread_summary.py
+
+from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.models.base import TenantModel
+
+
+class ThreadSummary(TenantModel):
+    __tablename__ = "thread_summaries"
+
+    thread_id = Column(
+        UUID(as_uuid=True), nullable=False, unique=True
+    )  # Nexus thread, one rolling summary per thread
+    bot_id = Column(UUID(as_uuid=True), ForeignKey("bots.id"), nullable=False)
+    content = Column(Text, nullable=False)  # compacted older turns
+    first_message_id = Column(String(64))  # oldest Nexus message covered
+    last_message_id = Column(String(64))  # newest Nexus message covered
+    message_count = Column(Integer, default=0)  # messages covered so far
+    covered_tokens = Column(Integer, default=0)  # estimated tokens they held
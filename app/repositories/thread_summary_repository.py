@@ -0,0 +1,5 @@
+from app.core.repository import BaseRepository
+from app.models.thread_summary import ThreadSummary
+
+class ThreadSummaryRepository(BaseRepository[ThreadSummary, None, None]):
+    pass
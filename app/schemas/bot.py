@@ -32,6 +32,7 @@ class BotConfigBase(BaseModel):
     temperature: float = 0.7
     top_p: float = 1.0
     top_k: int = 0
+    enable_response_cache: bool = False
     is_current: bool = True
     version: int = 1
 
@@ -1,6 +1,6 @@
-from typing import Optional
+from typing import Annotated, Literal, Optional, Union
 from uuid import UUID
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class CreateThreadRequest(BaseModel):
@@ -21,3 +21,36 @@ class SendMessageRequest(BaseModel):
     id: Optional[str] = None
     parent_id: Optional[str] = None
     status: str = "completed"
+
+
+class SocketMessageFrame(CreateMessageRequest):
+    """Client frame starting a generation on a chat WebSocket"""
+
+    type: Literal["message"]
+    bot_id: UUID
+    thread_id: UUID
+    last_event_id: Optional[str] = None
+
+
+class SocketResumeFrame(BaseModel):
+    """Client frame reattaching to a buffered generation"""
+
+    type: Literal["resume"]
+    thread_id: UUID
+    message_id: str
+    last_event_id: Optional[str] = None
+
+
+class SocketCancelFrame(BaseModel):
+    """Client frame that stops forwarding a generation"""
+
+    type: Literal["cancel"]
+    message_id: str
+
+
+SocketFrame = TypeAdapter(
+    Annotated[
+        Union[SocketMessageFrame, SocketResumeFrame, SocketCancelFrame],
+        Field(discriminator="type"),
+    ]
+)
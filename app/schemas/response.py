@@ -13,6 +13,10 @@ class Meta(BaseModel):
     per_page: Optional[int] = None
     total: Optional[int] = None
     total_pages: Optional[int] = None
+    has_more: Optional[bool] = None
+    estimated: Optional[bool] = None
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
 class StandardResponse(BaseModel, Generic[DataT]):
     success: bool
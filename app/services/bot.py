@@ -1,8 +1,9 @@
-from typing import Any, Dict, List, Optional
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
 from fastapi import Depends
 from sqlalchemy import UUID
 from app.core.exceptions import APIError
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal, get_db
 from app.models.bot import Bot, BotConfig, ConfigVariable, TeamBotAccess
 from app.models.master import MstItem
 from app.repositories.bot_repository import (
@@ -13,11 +14,24 @@ from app.repositories.bot_repository import (
 )
 from app.repositories.master_repository import MstItemRepository
 from sqlalchemy.ext.asyncio import AsyncSession
-import re
-from app.models.enums import AccessLevelEnum
+from app.models.enums import AccessLevelEnum, CountModeEnum
 
 from app.schemas.bot import BotConfigCreate, BotCreate
 from app.utils.http_client import HeimdallClient
+from app.utils.json_encoder import serialize_object
+from app.utils.prompt_template import compile_template
+
+EXPORT_COLUMNS = [
+    "id",
+    "name",
+    "tagline",
+    "description",
+    "category_id",
+    "status",
+    "access_level",
+    "created_at",
+    "updated_at",
+]
 
 
 class BotService:
@@ -31,15 +45,13 @@ class BotService:
         self.heimdall_client = HeimdallClient()
 
     async def _validate_category(self, category_id: UUID):
-        category = await self.mst_item_repo.get(
-            filters={"id": category_id}, select_fields=["id"]
-        )
+        category = await self.mst_item_repo.load(category_id)
         if not category:
             raise APIError(status_code=404, message="Category not found")
 
     async def create_bot(self, schema: BotCreate) -> Bot:
-        is_exists = await self.bot_repo.get(
-            filters={"name": schema.name}, select_fields=["id"], is_tenant_scoped=True
+        is_exists = await self.bot_repo.exists(
+            filters={"name": schema.name}, is_tenant_scoped=True
         )
         if is_exists:
             raise APIError(status_code=400, message="Bot name already exists")
@@ -51,22 +63,23 @@ class BotService:
         bot = await self.bot_repo.create(schema_bot)
         schema_configs = schema.configs
         if schema_configs:
-            for config in schema_configs:
-                await self.create_bot_config(bot.id, config)
+            await self.create_bot_configs(bot.id, schema_configs)
 
         schema_team_access = schema.team_access
         if schema_team_access and schema.access_level != AccessLevelEnum.ORG_LEVEL:
-            for team_access in schema_team_access:
-                await self.team_bot_access_repo.create(
+            await self.team_bot_access_repo.create_many(
+                [
                     {"team_id": team_access.team_id, "bot_id": bot.id}
-                )
+                    for team_access in schema_team_access
+                ]
+            )
 
         return await self.bot_repo.get(
             filters={"id": bot.id}, load_options=["configs.variables", "team_access"]
         )
 
     async def update_bot(self, id: UUID, schema: BotCreate) -> Bot:
-        bot = await self.bot_repo.get(filters={"id": id}, select_fields=["id", "name"])
+        bot = await self.bot_repo.load(id)
         if not bot:
             raise APIError(status_code=404, message="Bot not found")
 
@@ -74,10 +87,8 @@ class BotService:
             await self._validate_category(schema.category_id)
 
         if schema.name != bot.name:
-            is_exists = await self.bot_repo.get(
-                filters={"name": schema.name},
-                select_fields=["id"],
-                is_tenant_scoped=True,
+            is_exists = await self.bot_repo.exists(
+                filters={"name": schema.name}, is_tenant_scoped=True
             )
             if is_exists:
                 raise APIError(status_code=400, message="Bot name already exists")
@@ -90,15 +101,16 @@ class BotService:
 
         schema_configs = schema.configs
         if schema_configs:
-            for config in schema_configs:
-                await self.create_bot_config(bot.id, config)
+            await self.create_bot_configs(bot.id, schema_configs)
 
         await self.team_bot_access_repo.delete(filters={"bot_id": bot.id}, force=True)
         if schema.team_access and schema.access_level != AccessLevelEnum.ORG_LEVEL:
-            for team_access in schema.team_access:
-                await self.team_bot_access_repo.create(
+            await self.team_bot_access_repo.create_many(
+                [
                     {"team_id": team_access.team_id, "bot_id": bot.id}
-                )
+                    for team_access in schema.team_access
+                ]
+            )
 
         return await self.bot_repo.get(
             filters={"id": bot.id}, load_options=["configs.variables", "team_access"]
@@ -107,42 +119,49 @@ class BotService:
     async def create_bot_config(
         self, bot_id: UUID, schema: BotConfigCreate
     ) -> BotConfig:
-        bot_exists = await self.bot_repo.get(
-            filters={"id": bot_id}, select_fields=["id"]
-        )
+        bot_exists = await self.bot_repo.load(bot_id)
         if not bot_exists:
             raise APIError(status_code=404, message="Bot not found")
 
+        configs = await self.create_bot_configs(bot_id, [schema])
+        return configs[0]
+
+    async def create_bot_configs(
+        self, bot_id: UUID, schemas: List[BotConfigCreate]
+    ) -> List[BotConfig]:
+        """Next versions of the bot's config; the first ever one is current"""
         count = await self.bot_config_repo.count(filters={"bot_id": bot_id})
-        is_current = count == 0
-
-        config = await self.bot_config_repo.create(
-            {
-                **schema.model_dump(),
-                "bot_id": bot_id,
-                "version": count + 1,
-                "is_current": is_current,
-            }
+
+        configs = await self.bot_config_repo.create_many(
+            [
+                {
+                    **schema.model_dump(),
+                    "bot_id": bot_id,
+                    "version": count + i + 1,
+                    "is_current": count == 0 and i == 0,
+                }
+                for i, schema in enumerate(schemas)
+            ]
         )
 
-        await self.save_config_variables(config)
+        await self.save_config_variables(*configs)
 
-        return config
+        return configs
 
     async def update_bot_config(
         self, bot_id: UUID, config_id: UUID, schema: BotConfigCreate
     ) -> BotConfig:
-        bot_config = await self.bot_config_repo.get(
-            filters={"id": config_id, "bot_id": bot_id}, select_fields=["id"]
+        config_exists = await self.bot_config_repo.exists(
+            filters={"id": config_id, "bot_id": bot_id}
         )
-        if not bot_config:
+        if not config_exists:
             raise APIError(status_code=404, message="Bot config not found")
 
         await self.config_variable_repo.delete(
-            filters={"config_id": bot_config.id}, force=True
+            filters={"config_id": config_id}, force=True
         )
 
-        config = await self.bot_config_repo.update(bot_config.id, schema)
+        config = await self.bot_config_repo.update(config_id, schema)
 
         await self.save_config_variables(config)
 
@@ -155,32 +174,38 @@ class BotService:
         configs, _ = await self.bot_config_repo.get_multi(
             filters={"bot_id": bot_id}, select_fields=["id"]
         )
-        for config in configs:
-            if config.id != id:
-                await self.bot_config_repo.update(config.id, {"is_current": False})
+        await self.bot_config_repo.update_many(
+            [
+                {"id": config.id, "is_current": False}
+                for config in configs
+                if config.id != id
+            ]
+        )
 
         # update this config to be current
         await self.bot_config_repo.update(id, {"is_current": True})
 
-    async def save_config_variables(self, config: BotConfig):
-        custom_instructions = config.custom_instructions
-        if custom_instructions:
-            variables = re.findall(r"{{(\w+)}}", custom_instructions)
-            for variable in variables:
-                await self.config_variable_repo.create(
+    async def save_config_variables(self, *configs: BotConfig):
+        variables = []
+        for config in configs:
+            custom_instructions = config.custom_instructions
+            if custom_instructions:
+                variables.extend(
                     {"key": variable, "value": None, "config_id": config.id}
+                    for variable in compile_template(custom_instructions).variables
                 )
-        else:
-            await self.config_variable_repo.delete(
-                filters={"config_id": config.id}, force=True
-            )
+            else:
+                await self.config_variable_repo.delete(
+                    filters={"config_id": config.id}, force=True
+                )
+        await self.config_variable_repo.create_many(variables)
 
     async def delete_bot_config(self, id: UUID):
         await self.config_variable_repo.delete(filters={"config_id": id}, force=True)
         await self.bot_config_repo.delete(filters={"id": id}, force=True)
 
     async def delete_bot(self, id: UUID):
-        bot = await self.bot_repo.get(filters={"id": id}, select_fields=["id"])
+        bot = await self.bot_repo.load(id)
         if not bot:
             raise APIError(status_code=404, message="Bot not found")
 
@@ -206,9 +231,11 @@ class BotService:
         search_term: str = None,
         search_fields: Dict[str, str] = None,
         joins: List[str] = None,
+        count_mode: CountModeEnum = CountModeEnum.EXACT,
+        cursor: Optional[str] = None,
     ):
 
-        items, total = await self.bot_repo.get_multi(
+        page = await self.bot_repo.get_multi(
             skip=skip,
             limit=limit,
             filters=filters,
@@ -217,7 +244,10 @@ class BotService:
             joins=joins,
             load_options=["category", "team_access"],
             is_tenant_scoped=True,
+            count_mode=count_mode,
+            cursor=cursor,
         )
+        items = page.items
 
         team_ids = []
         for item in items:
@@ -240,7 +270,25 @@ class BotService:
                 if team_name:
                     team_access.team_name = team_name
 
-        return items, total
+        return page
+
+    async def export_bots(self, filters: Dict[str, Any] = None) -> AsyncIterator[str]:
+        """
+        The tenant's bots as NDJSON, streamed in batches. Uses its own
+        session: the response body is sent after the request's is closed.
+        """
+        async with AsyncSessionLocal() as db:
+            batches = BotRepository(Bot, db).stream(
+                filters=filters,
+                columns=EXPORT_COLUMNS,
+                order_by=["id"],
+                is_tenant_scoped=True,
+            )
+            async for batch in batches:
+                yield "".join(
+                    json.dumps(row._asdict(), default=serialize_object) + "\n"
+                    for row in batch
+                )
 
     async def get_bot(self, id: UUID, with_details: bool = True):
         load_options = ["category", "team_access"]
@@ -0,0 +1,177 @@
+import asyncio
+import json
+from contextlib import aclosing
+from typing import Any, Dict, Union
+from fastapi import WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+from app.core.exceptions import APIError
+from app.core.logging import logger
+from app.core.metrics import metrics
+from app.db.session import AsyncSessionLocal
+from app.schemas.chat import (
+    CreateMessageRequest,
+    SocketCancelFrame,
+    SocketFrame,
+    SocketMessageFrame,
+    SocketResumeFrame,
+)
+from app.services.conversation_service import ConversationService
+from uuid_extensions import uuid7
+
+socket_connections = metrics.gauge(
+    "chat_socket_connections", "Open chat WebSocket connections"
+)
+socket_streams = metrics.counter(
+    "chat_socket_streams_total",
+    "Generations multiplexed over chat WebSockets, by frame type",
+    ["type"],
+)
+
+
+class ChatSocketSession:
+    """
+    One authenticated chat WebSocket carrying several generations at once.
+
+    Every generation goes through `ConversationService` exactly like the SSE
+    endpoint (admission, preflight, stream buffer, persistence) and its
+    events are tagged with the assistant message id. Flow control is per
+    connection: at most `max_streams` generations are forwarded at a time and
+    outgoing frames go through a bounded queue, so a slow client makes its
+    forwarders wait (the stream buffer keeps the generation going) instead
+    of growing memory.
+    """
+
+    def __init__(
+        self, websocket: WebSocket, max_streams: int = 8, send_queue_size: int = 256
+    ):
+        self.websocket = websocket
+        self.max_streams = max_streams
+        self._outbox: asyncio.Queue = asyncio.Queue(maxsize=send_queue_size)
+        self._streams: Dict[str, asyncio.Task] = {}
+
+    async def run(self) -> None:
+        socket_connections.inc()
+        sender = asyncio.create_task(self._send_loop())
+        try:
+            while True:
+                await self._receive(await self.websocket.receive_text())
+        except WebSocketDisconnect:
+            pass
+        finally:
+            # Forwarders detach from their buffers; generations nobody
+            # reattaches to are cancelled and stored like SSE disconnects.
+            tasks = [sender, *self._streams.values()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            socket_connections.dec()
+
+    async def _send_loop(self) -> None:
+        while True:
+            await self.websocket.send_json(await self._outbox.get())
+
+    async def _send(self, frame: Dict[str, Any]) -> None:
+        await self._outbox.put(frame)
+
+    async def _send_error(self, error: APIError, message_id: str = None) -> None:
+        await self._send(
+            {
+                "type": "error",
+                "message_id": message_id,
+                "status_code": error.status_code,
+                "message": error.message,
+            }
+        )
+
+    async def _receive(self, raw: str) -> None:
+        try:
+            frame = SocketFrame.validate_python(json.loads(raw))
+        except (json.JSONDecodeError, ValidationError) as e:
+            await self._send_error(APIError(message=str(e), status_code=422))
+            return
+
+        if isinstance(frame, SocketCancelFrame):
+            task = self._streams.get(frame.message_id)
+            if task is not None:
+                task.cancel()
+            return
+
+        message_id = (
+            frame.message_id
+            if isinstance(frame, SocketResumeFrame)
+            else frame.response_id or str(uuid7())
+        )
+        if message_id in self._streams:
+            await self._send_error(
+                APIError(message="Response is already streaming", status_code=409),
+                message_id,
+            )
+            return
+        if len(self._streams) >= self.max_streams:
+            await self._send_error(
+                APIError(message="Too many concurrent streams", status_code=429),
+                message_id,
+            )
+            return
+
+        socket_streams.inc(type=frame.type)
+        self._streams[message_id] = asyncio.create_task(
+            self._forward(message_id, frame), name=f"chat-socket-{message_id}"
+        )
+
+    async def _open(
+        self, message_id: str, frame: Union[SocketMessageFrame, SocketResumeFrame]
+    ):
+        """Start or resume the generation, with a session for its preflight"""
+        async with AsyncSessionLocal() as db:
+            service = ConversationService(db)
+            if isinstance(frame, SocketResumeFrame):
+                return service.resume_stream(
+                    frame.thread_id, message_id, frame.last_event_id
+                )
+
+            schema = CreateMessageRequest(
+                **frame.model_dump(include=set(CreateMessageRequest.model_fields))
+            )
+            schema.response_id = message_id
+            return await service.process_user_message(
+                bot_id=frame.bot_id,
+                thread_id=frame.thread_id,
+                schema=schema,
+                stream=True,
+                last_event_id=frame.last_event_id,
+            )
+
+    async def _forward(
+        self, message_id: str, frame: Union[SocketMessageFrame, SocketResumeFrame]
+    ) -> None:
+        try:
+            events = await self._open(message_id, frame)
+            await self._send(
+                {
+                    "type": "started",
+                    "message_id": message_id,
+                    "thread_id": str(frame.thread_id),
+                }
+            )
+            async with aclosing(events):
+                async for event in events:
+                    if not isinstance(event, dict):
+                        event = {"data": event}
+                    await self._send(
+                        {"type": "event", "message_id": message_id, **event}
+                    )
+            await self._send({"type": "done", "message_id": message_id})
+        except asyncio.CancelledError:
+            if not self._outbox.full():
+                self._outbox.put_nowait({"type": "cancelled", "message_id": message_id})
+            raise
+        except APIError as e:
+            await self._send_error(e, message_id)
+        except Exception as e:
+            logger.error(f"Chat socket stream {message_id} failed: {e}")
+            await self._send_error(
+                APIError(message=str(e), status_code=500), message_id
+            )
+        finally:
+            self._streams.pop(message_id, None)
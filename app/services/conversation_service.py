@@ -1,25 +1,156 @@
-from typing import AsyncGenerator, List, Dict, Any, Union
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import AsyncGenerator, List, Dict, Any, Optional, Union
 from uuid import UUID
+import asyncio
 import json
+import re
+import time
+import weakref
 from fastapi.params import Depends
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal, get_db
 from app.schemas.chat import CreateMessageRequest, SendMessageRequest
+from app.services.thread_summarizer import thread_summarizer
 from app.utils.debug import debug_print
 from app.utils.http_client import FrostClient, NexusClient
 from app.models.bot import Bot, BotConfig
 from app.repositories.bot_repository import BotConfigRepository, BotRepository
+from app.core.config import settings
 from app.core.exceptions import APIError
-from botbrigade_llm import LLMClient
+from app.core.logging import logger
+from app.core.metrics import metrics
+from app.utils.background import spawn
+from app.utils.stage_timer import StageTimer
+from app.utils.idempotency import IdempotencyEntry, idempotency_registry
+from app.utils.tokens import estimate_tokens
+from app.utils.llm_client_pool import llm_client_pool
+from app.utils.llm_stream import extract_text
+from app.utils.prefetch_cache import prefetch_cache
+from app.utils.prompt_template import render_custom_instructions
+from app.utils.response_cache import build_cache_key, response_cache
+from app.utils.stream_scheduler import StreamLease, stream_scheduler
+from app.utils.stream_buffer import stream_broker
+from app.models.base import current_project_id, current_tenant_id, current_user_id
 from uuid_extensions import uuid7
 
+LLM_MODEL = "claudia-1"
+HISTORY_LIMIT = 10
+
+stream_cancelled_total = metrics.counter(
+    "chat_stream_cancelled_total",
+    "LLM streams cancelled because the SSE client disconnected",
+    ["model"],
+)
+stream_cancelled_tokens_saved = metrics.counter(
+    "chat_stream_cancelled_tokens_saved_total",
+    "Estimated output tokens not generated thanks to early cancellation",
+    ["model"],
+)
+stream_cancelled_seconds_saved = metrics.counter(
+    "chat_stream_cancelled_seconds_saved_total",
+    "Estimated generation seconds not spent thanks to early cancellation",
+    ["model"],
+)
+stream_ttft_seconds = metrics.histogram(
+    "chat_stream_ttft_seconds",
+    "Time from receiving the message to the first streamed token",
+    ["bot_id", "model"],
+)
+stream_duration_seconds = metrics.histogram(
+    "chat_stream_duration_seconds",
+    "Duration of completed LLM streams",
+    ["bot_id", "model"],
+)
+stream_tokens_per_second = metrics.histogram(
+    "chat_stream_tokens_per_second",
+    "Estimated output tokens per second after the first token",
+    ["bot_id", "model"],
+    buckets=(5, 10, 20, 50, 100, 200, 500, 1000),
+)
+stream_chunks = metrics.histogram(
+    "chat_stream_chunks",
+    "Text chunks per completed LLM stream",
+    ["bot_id", "model"],
+    buckets=(1, 10, 50, 100, 250, 500, 1000, 2500),
+)
+
 
 class StreamChunk(BaseModel):
     content: str
     done: bool = False
 
 
+@dataclass
+class ConversationContext:
+    """Everything the LLM call needs, produced by the shared preflight."""
+
+    api_key: str
+    config: BotConfig
+    bot_id: UUID
+    thread_id: UUID
+    user_msg_id: str
+    assistant_msg_id: str
+    messages: List[Dict[str, str]]
+    cache_key: Optional[str] = None
+
+
+@dataclass
+class PrefetchedConversation:
+    """Preflight reads warmed in the background when a thread is opened."""
+
+    config: BotConfig
+    history: List[Dict[str, str]]
+    credit_account: Dict[str, Any]
+    api_key: str
+
+    def size(self) -> int:
+        # Rough per-entry footprint; only history and instructions vary much
+        return (
+            1024
+            + len(self.config.custom_instructions or "")
+            + sum(len(message["content"] or "") for message in self.history)
+        )
+
+
+def schedule_prefetch(bot_id: UUID, thread_id: UUID) -> None:
+    """
+    Warm the reads of the next message POST on this thread. Nothing (session,
+    service, clients) is built here; the background load builds its own.
+    """
+    if not settings.PREFETCH_ENABLED:
+        return
+    prefetch_cache.schedule(
+        _prefetch_key(bot_id, thread_id),
+        lambda: _prefetch(bot_id, thread_id),
+        size=PrefetchedConversation.size,
+    )
+
+
+def _prefetch_key(bot_id: UUID, thread_id: UUID):
+    return (
+        current_tenant_id.get(),
+        current_user_id.get(),
+        current_project_id.get(),
+        str(bot_id),
+        str(thread_id),
+    )
+
+
+async def _prefetch(bot_id: UUID, thread_id: UUID) -> PrefetchedConversation:
+    # Runs after the triggering request has closed its session
+    async with AsyncSessionLocal() as db:
+        service = ConversationService(db)
+        config = await service._get_bot_config(bot_id)
+        history, credit_account, api_key = await asyncio.gather(
+            service._get_history(thread_id, bot_id),
+            service._get_credit_account(),
+            service._get_api_key(),
+        )
+    return PrefetchedConversation(config, history, credit_account, api_key)
+
+
 class ConversationService:
     def __init__(self, db: AsyncSession = Depends(get_db)):
         self.db = db
@@ -27,6 +158,7 @@ class ConversationService:
         self.bot_config_repo = BotConfigRepository(BotConfig, db)
         self.nexus_client = NexusClient()
         self.frost_client = FrostClient()
+        self.timer: Optional[StageTimer] = None
 
     async def process_user_message(
         self,
@@ -34,35 +166,229 @@ class ConversationService:
         thread_id: UUID,
         schema: CreateMessageRequest,
         stream: bool = True,
+        last_event_id: Optional[str] = None,
     ):
-        """Process a user message and handle streaming response."""
-        if not stream:
-            raise APIError(
-                status_code=405,
-                message="Non-streaming responses are not implemented yet",
+        """Process a user message and answer it as a stream or as one message."""
+        if not schema.response_id:
+            schema.response_id = str(uuid7())
+        self.timer = StageTimer(bot_id, LLM_MODEL)
+
+        owner = self._stream_owner(thread_id)
+        # A resubmitted message id is answered by its original generation
+        idempotency_key = (str(thread_id), schema.id) if schema.id else None
+        if idempotency_key:
+            entry = idempotency_registry.get(idempotency_key, owner)
+            if entry is not None:
+                return await self._attach_duplicate(entry, owner, stream, last_event_id)
+
+        if (
+            stream
+            and last_event_id is not None
+            and stream_broker.get(schema.response_id, owner)
+        ):
+            # A reconnect: continue the buffered generation
+            return stream_broker.resume(schema.response_id, owner, last_event_id)
+        # Whoever started it, a response id in use is rejected before a
+        # stream slot is leased or the user message is written
+        if stream_broker.exists(schema.response_id):
+            raise APIError(status_code=409, message="Response is already streaming")
+
+        if idempotency_key:
+            idempotency_registry.register(idempotency_key, owner, schema.response_id)
+        try:
+            if not stream:
+                return await self._reply(bot_id, thread_id, schema)
+            return await self._start_stream(bot_id, thread_id, schema, owner)
+        except BaseException:
+            idempotency_registry.discard(schema.response_id)
+            raise
+
+    async def _reply(
+        self, bot_id: UUID, thread_id: UUID, schema: CreateMessageRequest
+    ) -> Dict[str, Any]:
+        context = await self._prepare_conversation(bot_id, thread_id, schema)
+        context.cache_key = self._get_cache_key(context)
+        cached = self._get_cached_response(context)
+        if cached is not None:
+            return await self._save_context_reply(context, cached)
+        return await self._handle_completion_response(context)
+
+    async def _start_stream(
+        self, bot_id: UUID, thread_id: UUID, schema: CreateMessageRequest, owner
+    ) -> AsyncGenerator[dict, None]:
+        # Admit the stream before anything is written, so a 429 leaves no
+        # orphan user message behind.
+        with self.timer.stage("admission"):
+            lease = await stream_scheduler.acquire(
+                current_tenant_id.get(), current_project_id.get()
             )
+        try:
+            context = await self._prepare_conversation(bot_id, thread_id, schema)
+            context.cache_key = self._get_cache_key(context)
+            cached = self._get_cached_response(context)
+        except BaseException:
+            lease.release()
+            raise
 
-        config = await self._get_bot_config(bot_id)
+        if cached is not None:
+            lease.release()
+            events = stream_broker.start(
+                context.assistant_msg_id,
+                owner,
+                self._replay_cached_response(context, cached),
+            )
+            idempotency_registry.started(context.assistant_msg_id)
+            return events
 
-        user_message = await self._send_message_nexus(
-            thread_id,
-            SendMessageRequest(
-                content=schema.content,
-                role="user",
-                id=schema.id if schema.id else str(uuid7()),
-                parent_id=schema.parent_id if schema.parent_id else None,
-                status="completed",
-            ),
+        generator = self._handle_streaming_response(
+            api_key=context.api_key,
+            user_msg_id=context.user_msg_id,
+            thread_id=context.thread_id,
+            assistant_msg_id=context.assistant_msg_id,
+            messages=context.messages,
+            config=context.config,
+            cache_key=context.cache_key,
+            lease=lease,
+            timer=self.timer,
         )
+        # The generator releases the slot when it finishes; this covers a
+        # response that is dropped before it starts iterating.
+        weakref.finalize(generator, lease.release)
+        events = stream_broker.start(context.assistant_msg_id, owner, generator)
+        idempotency_registry.started(context.assistant_msg_id)
+        return events
 
-        messages = await self._get_formatted_messages(
-            thread_id=thread_id,
-            bot_id=bot_id,
-            system_message=config.custom_instructions,
+    async def _attach_duplicate(
+        self,
+        entry: IdempotencyEntry,
+        owner,
+        stream: bool,
+        last_event_id: Optional[str],
+    ):
+        """Serve a resubmitted message without writing to Nexus or the LLM."""
+        timeout = settings.IDEMPOTENCY_WAIT_SECONDS
+        if not stream:
+            return await entry.wait(timeout)
+
+        await entry.wait_started(timeout)
+        if stream_broker.get(entry.response_id, owner):
+            return stream_broker.resume(entry.response_id, owner, last_event_id)
+
+        # Answered without a stream, or its buffer has expired
+        await entry.wait(timeout)
+        return self._replay_chunks(entry.content)
+
+    def resume_stream(
+        self, thread_id: UUID, message_id: str, last_event_id: Optional[str]
+    ):
+        """Attach to a buffered generation after the event `last_event_id`."""
+        return stream_broker.resume(
+            message_id, self._stream_owner(thread_id), last_event_id
         )
 
-        credit_account = await self.frost_client.get(f"api/v1/credits/me")
-        credit_account_data = credit_account.json()["data"]
+    def _stream_owner(self, thread_id: UUID):
+        return (current_tenant_id.get(), current_user_id.get(), str(thread_id))
+
+    def _get_cached_response(self, context: ConversationContext) -> Optional[str]:
+        if not context.cache_key:
+            return None
+        return response_cache.get(context.cache_key, bot_id=str(context.bot_id))
+
+    def _get_cache_key(self, context: ConversationContext) -> Optional[str]:
+        """Cache key for deterministic configs that opted in, otherwise None."""
+        config = context.config
+        if not config.enable_response_cache or config.temperature != 0:
+            return None
+
+        sampling = {
+            "model_name": config.model_name,
+            "temperature": config.temperature,
+            "top_p": config.top_p,
+            "top_k": config.top_k,
+            "max_output_tokens": config.max_output_tokens,
+        }
+        return build_cache_key(LLM_MODEL, sampling, context.messages)
+
+    async def _replay_chunks(self, content: str) -> AsyncGenerator[str, None]:
+        """Replay a stored answer with the same chunk framing as the LLM."""
+        for piece in re.findall(r"\s*\S+\s*", content) or [content]:
+            yield json.dumps({"text": piece})
+
+    async def _replay_cached_response(
+        self, context: ConversationContext, content: str
+    ) -> AsyncGenerator[str, None]:
+        try:
+            async for chunk in self._replay_chunks(content):
+                yield chunk
+            await asyncio.shield(self._save_context_reply(context, content))
+        finally:
+            idempotency_registry.discard(context.assistant_msg_id)
+
+    async def _save_context_reply(
+        self, context: ConversationContext, content: str
+    ) -> Dict[str, Any]:
+        return await self._save_assistant_message(
+            api_key=context.api_key,
+            bot_id=context.bot_id,
+            thread_id=context.thread_id,
+            user_msg_id=context.user_msg_id,
+            assistant_msg_id=context.assistant_msg_id,
+            messages=context.messages,
+            content=content,
+        )
+
+    async def _prepare_conversation(
+        self, bot_id: UUID, thread_id: UUID, schema: CreateMessageRequest
+    ) -> ConversationContext:
+        """Preflight shared by streaming and non-streaming replies."""
+        timer = self.timer
+        prefetched = None
+        if settings.PREFETCH_ENABLED:
+            with timer.stage("prefetch"):
+                prefetched = await prefetch_cache.take(_prefetch_key(bot_id, thread_id))
+
+        with timer.stage("bot_config"):
+            if prefetched:
+                config = prefetched.config
+            else:
+                config = await self._get_bot_config(bot_id)
+
+        with timer.stage("nexus_user_write"):
+            user_message = await self._send_message_nexus(
+                thread_id,
+                SendMessageRequest(
+                    content=schema.content,
+                    role="user",
+                    id=schema.id if schema.id else str(uuid7()),
+                    parent_id=schema.parent_id if schema.parent_id else None,
+                    status="completed",
+                ),
+            )
+
+        with timer.stage("history"):
+            if prefetched:
+                # History read before the user message was written: keep any
+                # leading thread summary and as many messages as _get_history
+                # returns with the new one included
+                history = prefetched.history
+                summary = (
+                    history[:1] if history and history[0]["role"] == "system" else []
+                )
+                recent = history[len(summary) :][-(HISTORY_LIMIT - 1) :]
+                history = (
+                    summary + recent + [{"role": "user", "content": schema.content}]
+                )
+            else:
+                history = await self._get_history(thread_id, bot_id)
+            messages = self._format_messages(
+                render_custom_instructions(config, config.variables), history
+            )
+
+        with timer.stage("frost_credit"):
+            if prefetched:
+                credit_account_data = prefetched.credit_account
+            else:
+                credit_account_data = await self._get_credit_account()
         if credit_account_data["balance"] < 0:
             raise APIError(
                 status_code=402, message="Your credit account has insufficient balance"
@@ -70,20 +396,42 @@ class ConversationService:
         if credit_account_data["status"] != "ACTIVE":
             raise APIError(status_code=402, message="Your Credit Account is not active")
 
-        project_api_key = await self.frost_client.get(
-            "api/v1/project-api-keys/me/current"
-        )
-        project_api_key_data = project_api_key.json()["data"]
-        api_key = project_api_key_data["key"]
+        with timer.stage("frost_api_key"):
+            if prefetched:
+                api_key = prefetched.api_key
+            else:
+                api_key = await self._get_api_key()
 
-        return self._handle_streaming_response(
+        return ConversationContext(
             api_key=api_key,
-            user_msg_id=user_message["id"],
+            config=config,
+            bot_id=bot_id,
             thread_id=thread_id,
+            user_msg_id=user_message["id"],
             assistant_msg_id=schema.response_id,
             messages=messages,
         )
 
+    async def _handle_completion_response(
+        self, context: ConversationContext
+    ) -> Dict[str, Any]:
+        """Generate the whole reply with a single completion call."""
+        llm_client = llm_client_pool.get(context.api_key)
+        with self.timer.stage("llm_completion"):
+            response = await llm_client.responses.acreate(
+                model=LLM_MODEL,
+                messages=context.messages,
+            )
+        if "error" in response:
+            logger.error(f"LLM completion failed: {response['error']}")
+            raise APIError(status_code=502, message="LLM completion failed")
+
+        content = response["choices"][0]["message"]["content"]
+        if context.cache_key:
+            response_cache.set(context.cache_key, content)
+
+        return await self._save_context_reply(context, content)
+
     async def _handle_streaming_response(
         self,
         api_key: str,
@@ -91,43 +439,121 @@ class ConversationService:
         user_msg_id: str,
         assistant_msg_id: str,
         messages: List[Dict[str, str]],
+        config: BotConfig,
+        cache_key: Optional[str] = None,
+        lease: Optional[StreamLease] = None,
+        timer: Optional[StageTimer] = None,
     ) -> Union[Dict[str, Any], AsyncGenerator[StreamChunk, None]]:
         """Handle the streaming response from the LLM."""
         accumulated_content = []
+        stream_failed = False
+        timer = timer or StageTimer(config.bot_id, LLM_MODEL)
 
         debug_print("messages", messages)
 
-        llm_client = LLMClient(api_key=api_key)
+        # The scheduler slot is held until the LLM is done
+        slot = lease or nullcontext()
+        async with slot, llm_client_pool.lease(api_key) as llm_client:
+            stream = await llm_client.responses.acreate(
+                model=LLM_MODEL,
+                messages=messages,
+                stream=True,
+            )
+            started_at = time.monotonic()
+            first_token_at = None
 
-        async for chunk in await llm_client.responses.acreate(
-            model="claudia-1",
-            messages=messages,
-            stream=True,
-        ):
             try:
-                # yield chunk
-                # if chunk.startswith("event: message_stop"):
-                #     yield StreamChunk(content="", done=True)
-                #     break
-
-                if isinstance(chunk, str):
-                    chunk_data = json.loads(chunk)
-                    if "text" in chunk_data:
-                        text = chunk_data["text"]
-                        accumulated_content.append(text)
+                async for chunk in stream:
+                    if not isinstance(chunk, str):
+                        stream_failed = True
                         yield chunk
-                else:
+                        break
+
+                    # Text chunks are forwarded as received, without a re-dump
+                    text = extract_text(chunk)
+                    if text is None:
+                        continue
+                    if first_token_at is None:
+                        first_token_at = time.monotonic()
+                        timer.record("llm_first_byte", first_token_at - started_at)
+                        stream_ttft_seconds.observe(timer.elapsed(), **timer.labels)
+                    accumulated_content.append(text)
                     yield chunk
-                    break
-            except json.JSONDecodeError:
-                continue
+            except (asyncio.CancelledError, GeneratorExit):
+                # The SSE client went away: sse_starlette cancels this
+                # generator (or closes it at a yield). Anything awaited here
+                # would be cancelled again, so closing the upstream stream and
+                # persisting the partial answer runs detached from the request.
+                # A resubmission of the message starts a fresh generation.
+                idempotency_registry.discard(assistant_msg_id)
+                spawn(
+                    self._finalize_cancelled_stream(
+                        stream=stream,
+                        thread_id=thread_id,
+                        user_msg_id=user_msg_id,
+                        assistant_msg_id=assistant_msg_id,
+                        content="".join(accumulated_content),
+                        max_output_tokens=config.max_output_tokens,
+                        started_at=first_token_at or started_at,
+                    ),
+                    name=f"finalize-cancelled-stream-{assistant_msg_id}",
+                )
+                raise
 
         full_content = "".join(accumulated_content)
+        self._observe_stream(
+            timer, started_at, first_token_at, len(accumulated_content), full_content
+        )
+        if stream_failed:
+            idempotency_registry.discard(assistant_msg_id)
+        elif cache_key:
+            response_cache.set(cache_key, full_content)
 
-        await self._send_message_nexus(
+        # The answer is complete; abandoning the stream must not lose it
+        await asyncio.shield(
+            self._save_assistant_message(
+                api_key=api_key,
+                bot_id=config.bot_id,
+                thread_id=thread_id,
+                user_msg_id=user_msg_id,
+                assistant_msg_id=assistant_msg_id,
+                messages=messages,
+                content=full_content,
+            )
+        )
+
+    def _observe_stream(
+        self,
+        timer: StageTimer,
+        started_at: float,
+        first_token_at: Optional[float],
+        chunk_count: int,
+        content: str,
+    ) -> None:
+        finished_at = time.monotonic()
+        stream_duration_seconds.observe(finished_at - started_at, **timer.labels)
+        stream_chunks.observe(chunk_count, **timer.labels)
+        if first_token_at is not None and finished_at > first_token_at:
+            stream_tokens_per_second.observe(
+                estimate_tokens(content) / (finished_at - first_token_at),
+                **timer.labels,
+            )
+
+    async def _save_assistant_message(
+        self,
+        api_key: str,
+        bot_id: UUID,
+        thread_id: UUID,
+        user_msg_id: str,
+        assistant_msg_id: str,
+        messages: List[Dict[str, str]],
+        content: str,
+    ) -> Dict[str, Any]:
+        """Persist a completed reply and name the thread after its first turn."""
+        assistant_message = await self._send_message_nexus(
             thread_id,
             SendMessageRequest(
-                content=full_content,
+                content=content,
                 role="assistant",
                 id=assistant_msg_id,
                 parent_id=user_msg_id,
@@ -135,20 +561,77 @@ class ConversationService:
             ),
         )
 
+        idempotency_registry.complete(assistant_msg_id, assistant_message, content)
+        thread_summarizer.schedule(bot_id, thread_id, api_key)
+
         if len(messages) == 2:
             # remove system message
             messages.pop(0)
             fist_two_messages = messages
-            fist_two_messages.append({"role": "assistant", "content": full_content})
+            fist_two_messages.append({"role": "assistant", "content": content})
             await self._update_thread_name(api_key, thread_id, fist_two_messages)
 
+        return assistant_message
+
+    async def _finalize_cancelled_stream(
+        self,
+        stream: AsyncGenerator[str, None],
+        thread_id: UUID,
+        user_msg_id: str,
+        assistant_msg_id: str,
+        content: str,
+        max_output_tokens: int,
+        started_at: float,
+    ):
+        """Stop the upstream generation and store what was streamed so far."""
+        # Closing the generator exits the upstream httpx stream context, which
+        # drops the connection and makes the gateway stop generating.
+        aclose = getattr(stream, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+        generated_tokens = estimate_tokens(content)
+        elapsed = time.monotonic() - started_at
+        # Upper-bound estimate: the model could have used the remaining output
+        # budget, at the rate observed so far.
+        tokens_saved = max((max_output_tokens or 0) - generated_tokens, 0)
+        seconds_saved = (
+            tokens_saved * elapsed / generated_tokens if generated_tokens else 0.0
+        )
+        stream_cancelled_total.inc(model=LLM_MODEL)
+        stream_cancelled_tokens_saved.inc(tokens_saved, model=LLM_MODEL)
+        stream_cancelled_seconds_saved.inc(seconds_saved, model=LLM_MODEL)
+
+        logger.info(
+            f"Client disconnected, cancelled stream {assistant_msg_id} after {generated_tokens} tokens",
+            extra={
+                "event_type": "chat_stream_cancelled",
+                "thread_id": str(thread_id),
+                "assistant_msg_id": assistant_msg_id,
+                "generated_tokens": generated_tokens,
+                "tokens_saved": tokens_saved,
+                "seconds_saved": round(seconds_saved, 2),
+            },
+        )
+
+        await self._send_message_nexus(
+            thread_id,
+            SendMessageRequest(
+                content=content,
+                role="assistant",
+                id=assistant_msg_id,
+                parent_id=user_msg_id,
+                status="cancelled",
+            ),
+        )
+
     async def _update_thread_name(
         self, api_key: str, thread_id: UUID, fist_two_messages: List[Dict[str, str]]
     ):
 
-        llm_client = LLMClient(api_key=api_key)
-        response = llm_client.responses.create(
-            model="claudia-1",
+        llm_client = llm_client_pool.get(api_key)
+        response = await llm_client.responses.acreate(
+            model=LLM_MODEL,
             messages=[
                 {
                     "role": "user",
@@ -163,28 +646,40 @@ class ConversationService:
             json={"name": content},
         )
 
-    async def _get_formatted_messages(
-        self, thread_id: UUID, bot_id: UUID, system_message: str
+    async def _get_history(self, thread_id: UUID, bot_id: UUID) -> List[Dict[str, str]]:
+        """Get the thread's summary and latest messages as LLM messages."""
+        res, summary = await asyncio.gather(
+            self.nexus_client.get(
+                f"api/v1/messages/{thread_id}",
+                params={"skip": 0, "limit": HISTORY_LIMIT, "group_by": str(bot_id)},
+            ),
+            thread_summarizer.get_summary(thread_id),
+        )
+        return thread_summarizer.apply(summary, res.json()["data"])
+
+    def _format_messages(
+        self, system_message: Optional[str], history: List[Dict[str, str]]
     ) -> List[Dict[str, str]]:
         """Get formatted conversation history for LLM."""
-        res = await self.nexus_client.get(
-            f"api/v1/messages/{thread_id}",
-            params={"skip": 0, "limit": 10, "group_by": str(bot_id)},
-        )
-        messages = res.json()["data"]
         formatted_messages = []
         if system_message:
             formatted_messages.append({"role": "system", "content": system_message})
-        for message in messages:
-            formatted_messages.append(
-                {"role": message["role"], "content": message["content"]}
-            )
-
+        formatted_messages.extend(history)
         return formatted_messages
 
+    async def _get_credit_account(self) -> Dict[str, Any]:
+        credit_account = await self.frost_client.get(f"api/v1/credits/me")
+        return credit_account.json()["data"]
+
+    async def _get_api_key(self) -> str:
+        project_api_key = await self.frost_client.get(
+            "api/v1/project-api-keys/me/current"
+        )
+        return project_api_key.json()["data"]["key"]
+
     async def _get_bot_config(self, bot_id: UUID) -> BotConfig:
         """Retrieve the bot configuration."""
-        bot = await self.bot_repo.get(filters={"id": bot_id}, select_fields=["id"])
+        bot = await self.bot_repo.load(bot_id)
         if not bot:
             raise APIError(status_code=404, message="Bot not found")
 
@@ -193,6 +688,7 @@ class ConversationService:
                 "bot_id": bot_id,
                 "is_current": True,
             },
+            load_options=["variables"],
         )
         if not config:
             raise APIError(status_code=404, message="Bot config not found")
@@ -1,9 +1,11 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 from uuid import UUID
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.exceptions import APIError
+from app.core.repository import Page
 from app.db.session import get_db
+from app.models.enums import CountModeEnum
 from app.models.master import MstCategory, MstItem
 from app.repositories.master_repository import MstCategoryRepository, MstItemRepository
 from app.schemas.master import MstCategoryBase, MstItemBase
@@ -26,9 +28,7 @@ class MasterService:
     async def update_mst_category(
         self, id: UUID, schema: MstCategoryBase
     ) -> MstCategory:
-        existing = await self.mst_category_repo.get(
-            filters={"id": id}, select_fields=["id"]
-        )
+        existing = await self.mst_category_repo.load(id)
         if not existing:
             raise APIError(status_code=404, message="MstCategory not found")
 
@@ -36,24 +36,29 @@ class MasterService:
         return await self.mst_category_repo.update(id, schema)
 
     async def delete_mst_category(self, id: UUID) -> None:
-        existing = await self.mst_category_repo.get(
-            filters={"id": id}, select_fields=["id"]
-        )
+        existing = await self.mst_category_repo.load(id)
         if not existing:
             raise APIError(status_code=404, message="MstCategory not found")
 
         return await self.mst_category_repo.delete(id)
 
     async def get_mst_category(self, id: UUID) -> MstCategory:
-        return await self.mst_category_repo.get(filters={"id": id})
+        return await self.mst_category_repo.load(id)
 
     async def get_mst_categories(
-        self, skip: int = 0, limit: int = 10, filters: Optional[Dict[str, Any]] = None
-    ) -> tuple[List[MstCategory], int]:
+        self,
+        skip: int = 0,
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        count_mode: CountModeEnum = CountModeEnum.EXACT,
+        cursor: Optional[str] = None,
+    ) -> Page[MstCategory]:
         return await self.mst_category_repo.get_multi(
             skip=skip,
             limit=limit,
             filters=filters,
+            count_mode=count_mode,
+            cursor=cursor,
         )
 
     async def _get_category_id(self, slug: str) -> UUID:
@@ -77,7 +82,7 @@ class MasterService:
         self, slug: str, id: UUID, schema: MstItemBase
     ) -> MstItem:
         category_id = await self._get_category_id(slug)
-        existing = await self.mst_item_repo.get(
+        existing = await self.mst_item_repo.exists(
             filters={"id": id, "category_id": category_id}
         )
         if not existing:
@@ -87,7 +92,7 @@ class MasterService:
 
     async def delete_mst_item(self, slug: str, id: UUID) -> None:
         category_id = await self._get_category_id(slug)
-        existing = await self.mst_item_repo.get(
+        existing = await self.mst_item_repo.exists(
             filters={"id": id, "category_id": category_id}
         )
         if not existing:
@@ -96,7 +101,7 @@ class MasterService:
         return await self.mst_item_repo.delete(id)
 
     async def get_mst_item(self, id: UUID) -> MstItem:
-        return await self.mst_item_repo.get(filters={"id": id})
+        return await self.mst_item_repo.load(id)
 
     async def get_mst_items(
         self,
@@ -104,10 +109,16 @@ class MasterService:
         skip: int = 0,
         limit: int = 10,
         filters: Optional[Dict[str, Any]] = None,
-    ) -> tuple[List[MstItem], int]:
+        count_mode: CountModeEnum = CountModeEnum.EXACT,
+        cursor: Optional[str] = None,
+    ) -> Page[MstItem]:
         category_id = await self._get_category_id(slug)
         filters = filters or {}
         filters["category_id"] = category_id
         return await self.mst_item_repo.get_multi(
-            skip=skip, limit=limit, filters=filters
+            skip=skip,
+            limit=limit,
+            filters=filters,
+            count_mode=count_mode,
+            cursor=cursor,
         )
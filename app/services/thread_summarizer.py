@@ -0,0 +1,241 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+from sqlalchemy import select
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import metrics
+from app.db.session import AsyncSessionLocal
+from app.models.thread_summary import ThreadSummary
+from app.repositories.thread_summary_repository import ThreadSummaryRepository
+from app.utils.background import spawn
+from app.utils.http_client import NexusClient
+from app.utils.llm_client_pool import llm_client_pool
+from app.utils.tokens import estimate_tokens
+
+SUMMARY_MODEL = "claudia-1"
+SUMMARY_PROMPT = (
+    "You maintain the running summary of a conversation between a user and an "
+    "assistant. Merge the previous summary (if any) with the new turns into one "
+    "concise summary that keeps names, facts, decisions, open questions and the "
+    "user's preferences. Only return the summary itself."
+)
+
+summaries_total = metrics.counter(
+    "chat_thread_summaries_total",
+    "Background summarization runs by result (created, updated, stale, failed)",
+    ["result"],
+)
+summary_lookups = metrics.counter(
+    "chat_thread_summary_lookups_total",
+    "Summary lookups while building history, by result (hit, miss)",
+    ["result"],
+)
+summarized_tokens = metrics.counter(
+    "chat_thread_summarized_tokens_total",
+    "Estimated history tokens compacted into summaries",
+)
+
+
+class ThreadSummarizer:
+    """
+    Rolling summaries of long threads, kept off the request path.
+
+    After each stored reply the thread is checked in the background: once
+    the turns not yet covered by its summary exceed `trigger_tokens`, all
+    but the `keep_recent` newest of them are folded into the summary, which
+    records the range of messages it covers. History then becomes the
+    summary plus the turns after that range.
+
+    At most `max_concurrent` runs happen at a time and each thread has at
+    most one. Summaries are cached per worker for `cache_ttl` seconds so
+    each message costs no extra query; another instance may replace a row
+    meanwhile, so a run only writes over the summary it started from.
+    """
+
+    def __init__(
+        self,
+        trigger_tokens: int = 3000,
+        keep_recent: int = 6,
+        scan_limit: int = 100,
+        max_concurrent: int = 4,
+        cache_size: int = 1024,
+        cache_ttl: float = 60.0,
+    ):
+        self.trigger_tokens = trigger_tokens
+        self.keep_recent = keep_recent
+        self.scan_limit = scan_limit
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._running: Set[str] = set()
+        self._cache: "OrderedDict[str, Tuple[float, Optional[ThreadSummary]]]" = (
+            OrderedDict()
+        )
+
+    def _cache_put(self, thread_id: str, summary: Optional[ThreadSummary]) -> None:
+        self._cache[thread_id] = (time.monotonic() + self.cache_ttl, summary)
+        self._cache.move_to_end(thread_id)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def get_summary(self, thread_id: UUID) -> Optional[ThreadSummary]:
+        key = str(thread_id)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self._cache.move_to_end(key)
+            summary_lookups.inc(result="hit")
+            return cached[1]
+
+        summary_lookups.inc(result="miss")
+        async with AsyncSessionLocal() as db:
+            summary = await ThreadSummaryRepository(ThreadSummary, db).get(
+                filters={"thread_id": thread_id}
+            )
+        self._cache_put(key, summary)
+        return summary
+
+    def apply(
+        self, summary: Optional[ThreadSummary], messages: List[Dict[str, Any]]
+    ) -> List[Dict[str, str]]:
+        """LLM history: the summary, then the messages after the range it covers"""
+        history = []
+        if summary is not None:
+            messages = self._uncovered(summary, messages)
+            content = f"Summary of the earlier conversation:\n{summary.content}"
+            history.append({"role": "system", "content": content})
+        history.extend(
+            {"role": message["role"], "content": message["content"]}
+            for message in messages
+        )
+        return history
+
+    def _uncovered(
+        self, summary: Optional[ThreadSummary], messages: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        if summary is None:
+            return messages
+        for i, message in enumerate(messages):
+            if str(message.get("id")) == summary.last_message_id:
+                return messages[i + 1 :]
+        # The covered range is older than the window (or the summary lags)
+        return messages
+
+    def schedule(self, bot_id: UUID, thread_id: UUID, api_key: str) -> None:
+        """Check the thread in the background after a reply was stored"""
+        if not settings.SUMMARY_ENABLED or str(thread_id) in self._running:
+            return
+        self._running.add(str(thread_id))
+        spawn(
+            self._run(bot_id, thread_id, api_key),
+            name=f"summarize-thread-{thread_id}",
+        )
+
+    async def _run(self, bot_id: UUID, thread_id: UUID, api_key: str) -> None:
+        try:
+            async with self._semaphore:
+                await self._summarize(bot_id, thread_id, api_key)
+        except Exception as e:
+            summaries_total.inc(result="failed")
+            logger.error(f"Summarizing thread {thread_id} failed: {e}")
+        finally:
+            self._running.discard(str(thread_id))
+
+    async def _summarize(self, bot_id: UUID, thread_id: UUID, api_key: str) -> None:
+        res = await NexusClient().get(
+            f"api/v1/messages/{thread_id}",
+            params={"skip": 0, "limit": self.scan_limit, "group_by": str(bot_id)},
+        )
+        summary = await self.get_summary(thread_id)
+        uncovered = self._uncovered(summary, res.json()["data"])
+
+        tokens = sum(estimate_tokens(message["content"]) for message in uncovered)
+        older = uncovered[: -self.keep_recent] if self.keep_recent else uncovered
+        if tokens < self.trigger_tokens or not older:
+            return
+
+        created = summary is None
+        content = await self._generate(api_key, summary, older)
+        older_tokens = sum(estimate_tokens(message["content"]) for message in older)
+        values = {
+            "content": content,
+            "last_message_id": str(older[-1]["id"]),
+            "message_count": (summary.message_count if summary else 0) + len(older),
+            "covered_tokens": (summary.covered_tokens if summary else 0) + older_tokens,
+        }
+
+        async with AsyncSessionLocal() as db:
+            repo = ThreadSummaryRepository(ThreadSummary, db)
+            # Locked, so no other instance updates the row until we commit
+            current = await db.scalar(
+                select(ThreadSummary)
+                .where(ThreadSummary.thread_id == thread_id)
+                .with_for_update()
+            )
+            based_on = summary.last_message_id if summary else None
+            if (current.last_message_id if current else None) != based_on:
+                # Another instance summarized the thread meanwhile; keep theirs
+                self._cache_put(str(thread_id), current)
+                summaries_total.inc(result="stale")
+                return
+
+            if created:
+                values.update(
+                    thread_id=thread_id,
+                    bot_id=bot_id,
+                    first_message_id=str(older[0]["id"]),
+                )
+                # Two instances may create the thread's first summary at once;
+                # the one that loses keeps the other's, as for a stale update
+                created_rows = await repo.upsert_many(
+                    [values], index_elements=["thread_id"], update_fields=[]
+                )
+                if not created_rows:
+                    await db.rollback()
+                    summary = await repo.get(filters={"thread_id": thread_id})
+                    self._cache_put(str(thread_id), summary)
+                    summaries_total.inc(result="stale")
+                    return
+                summary = created_rows[0]
+            else:
+                summary = await repo.update(summary.id, values)
+            await db.commit()
+
+        self._cache_put(str(thread_id), summary)
+        summaries_total.inc(result="created" if created else "updated")
+        summarized_tokens.inc(older_tokens)
+
+    async def _generate(
+        self,
+        api_key: str,
+        summary: Optional[ThreadSummary],
+        messages: List[Dict[str, Any]],
+    ) -> str:
+        turns = "\n".join(
+            f"{message['role']}: {message['content']}" for message in messages
+        )
+        previous = summary.content if summary else "(none)"
+        llm_client = llm_client_pool.get(api_key)
+        response = await llm_client.responses.acreate(
+            model=SUMMARY_MODEL,
+            messages=[
+                {"role": "system", "content": SUMMARY_PROMPT},
+                {
+                    "role": "user",
+                    "content": f"Previous summary:\n{previous}\n\nNew turns:\n{turns}",
+                },
+            ],
+        )
+        if "error" in response:
+            raise RuntimeError(f"LLM summarization failed: {response['error']}")
+        return response["choices"][0]["message"]["content"]
+
+
+thread_summarizer = ThreadSummarizer(
+    trigger_tokens=settings.SUMMARY_TRIGGER_TOKENS,
+    keep_recent=settings.SUMMARY_KEEP_RECENT_MESSAGES,
+    scan_limit=settings.SUMMARY_SCAN_LIMIT,
+    max_concurrent=settings.SUMMARY_MAX_CONCURRENT,
+)
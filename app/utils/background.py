@@ -0,0 +1,39 @@
+import asyncio
+from typing import Coroutine, Optional, Set
+from app.core.logging import logger
+
+# Strong references so fire-and-forget tasks are not garbage collected mid-flight
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def _on_task_done(task: asyncio.Task) -> None:
+    _background_tasks.discard(task)
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        logger.error(
+            f"Background task {task.get_name()} failed: {exc}",
+            extra={"event_type": "background_task_failed", "error": str(exc)},
+        )
+
+
+def spawn(coro: Coroutine, name: Optional[str] = None) -> asyncio.Task:
+    """
+    Run a coroutine detached from the current request.
+
+    The task copies the current context (tenant, user, bearer token), but is not
+    affected when the request task is cancelled, e.g. on client disconnect.
+    """
+    task = asyncio.create_task(coro, name=name)
+    _background_tasks.add(task)
+    task.add_done_callback(_on_task_done)
+    return task
+
+
+async def cancel_background_tasks() -> None:
+    """Cancel outstanding background tasks on application shutdown"""
+    tasks = list(_background_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,91 @@
+import asyncio
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple, Type
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.metrics import metrics
+
+loader_lookups = metrics.counter(
+    "repository_loader_lookups_total",
+    "Lookups by id through the batch loader, by result (hit, batched)",
+    ["result"],
+)
+loader_batch_size = metrics.histogram(
+    "repository_loader_batch_size",
+    "Ids fetched per WHERE id IN (...) query",
+    buckets=(1, 2, 5, 10, 20, 50, 100),
+)
+
+
+class BatchLoader:
+    """
+    Lookups by id for one session (i.e. one request), DataLoader style.
+
+    Ids requested in the same event-loop tick are fetched with a single
+    `WHERE id IN (...)` per model; results, including misses, are kept for
+    the rest of the session so repeated lookups cost nothing. Soft-deleted
+    rows count as missing. Repositories `forget` ids they write to.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._results: Dict[Tuple[Type, Hashable], Any] = {}
+        self._pending: Dict[Type, Dict[Hashable, asyncio.Future]] = {}
+        self._dispatches: Set[asyncio.Task] = set()
+
+    @classmethod
+    def for_session(cls, db: AsyncSession) -> "BatchLoader":
+        loader = db.info.get("batch_loader")
+        if loader is None:
+            loader = db.info["batch_loader"] = cls(db)
+        return loader
+
+    async def load(self, model: Type, id: Hashable) -> Optional[Any]:
+        key = (model, id)
+        if key in self._results:
+            loader_lookups.inc(result="hit")
+            return self._results[key]
+
+        loader_lookups.inc(result="batched")
+        pending = self._pending.setdefault(model, {})
+        future = pending.get(id)
+        if future is None:
+            if not pending:
+                # Runs once the current tick's callers have queued their ids
+                task = asyncio.create_task(self._dispatch(model))
+                self._dispatches.add(task)
+                task.add_done_callback(self._dispatches.discard)
+            future = pending[id] = asyncio.get_running_loop().create_future()
+        # Other callers may be waiting for the same id
+        return await asyncio.shield(future)
+
+    async def load_many(self, model: Type, ids: Iterable[Hashable]) -> List[Any]:
+        return list(await asyncio.gather(*(self.load(model, id) for id in ids)))
+
+    async def _dispatch(self, model: Type) -> None:
+        pending = self._pending.pop(model, {})
+        if not pending:
+            return
+        loader_batch_size.observe(len(pending))
+        try:
+            query = select(model).where(model.id.in_(list(pending)))
+            if hasattr(model, "deleted_at"):
+                query = query.where(model.deleted_at.is_(None))
+            rows = {row.id: row for row in (await self.db.scalars(query)).all()}
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for id, future in pending.items():
+            self._results[(model, id)] = rows.get(id)
+            if not future.done():
+                future.set_result(rows.get(id))
+
+    def forget(self, model: Type, id: Optional[Hashable] = None) -> None:
+        """Drop remembered results for one id, or every id of the model"""
+        if id is not None:
+            self._results.pop((model, id), None)
+            return
+        for key in [key for key in self._results if key[0] is model]:
+            del self._results[key]
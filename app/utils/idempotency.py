@@ -0,0 +1,138 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+from app.core.config import settings
+from app.core.exceptions import APIError
+from app.core.metrics import metrics
+
+duplicate_submissions = metrics.counter(
+    "chat_duplicate_submissions_total",
+    "Duplicate message submissions served without a new generation, by state",
+    ["state"],
+)
+
+IdempotencyKey = Tuple[str, str]
+
+
+class IdempotencyEntry:
+    """Outcome of one (thread_id, message id) submission"""
+
+    def __init__(
+        self, key: IdempotencyKey, owner: Hashable, response_id: str, ttl: float
+    ):
+        loop = asyncio.get_running_loop()
+        self.key = key
+        self.owner = owner
+        self.response_id = response_id
+        self.message: Optional[Dict[str, Any]] = None
+        self.content: Optional[str] = None
+        self.expires_at = time.monotonic() + ttl
+        self._started = loop.create_future()
+        self._done = loop.create_future()
+
+    @property
+    def running(self) -> bool:
+        return not self._done.done()
+
+    async def wait_started(self, timeout: float) -> None:
+        """Wait until the generation is streaming (or already finished)"""
+        await asyncio.wait(
+            {self._started, self._done},
+            timeout=timeout,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+
+    async def wait(self, timeout: float) -> Dict[str, Any]:
+        """Wait for the original submission and return its stored message"""
+        try:
+            return await asyncio.wait_for(asyncio.shield(self._done), timeout)
+        except asyncio.CancelledError:
+            if not self._done.cancelled():
+                raise
+        except asyncio.TimeoutError:
+            raise APIError(
+                status_code=504, message="Original message is still being answered"
+            )
+        raise APIError(status_code=409, message="Original message failed, please retry")
+
+
+class IdempotencyRegistry:
+    """
+    In-process registry of message submissions keyed by (thread_id, message
+    id). A duplicate of a running submission attaches to its generation and
+    a duplicate of a finished one replays the stored answer, so neither
+    writes to Nexus or calls the LLM again. Entries expire `ttl` seconds
+    after registration or completion; at most `max_entries` are kept.
+    """
+
+    def __init__(self, ttl: float = 3600.0, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[IdempotencyKey, IdempotencyEntry]" = OrderedDict()
+        self._by_response: Dict[str, IdempotencyKey] = {}
+
+    def _remove(self, key: IdempotencyKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._by_response.pop(entry.response_id, None)
+        # Duplicates waiting on a removed submission get a 409
+        entry._started.cancel()
+        entry._done.cancel()
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, e in self._entries.items() if e.expires_at < now]:
+            self._remove(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def get(self, key: IdempotencyKey, owner: Hashable) -> Optional[IdempotencyEntry]:
+        self._prune()
+        entry = self._entries.get(key)
+        if entry is None or entry.owner != owner:
+            return None
+        duplicate_submissions.inc(state="running" if entry.running else "completed")
+        return entry
+
+    def register(
+        self, key: IdempotencyKey, owner: Hashable, response_id: str
+    ) -> IdempotencyEntry:
+        self._prune()
+        entry = IdempotencyEntry(key, owner, response_id, self.ttl)
+        self._entries[key] = entry
+        self._by_response[response_id] = key
+        return entry
+
+    def _get_by_response(self, response_id: str) -> Optional[IdempotencyEntry]:
+        key = self._by_response.get(response_id)
+        return self._entries.get(key) if key else None
+
+    def started(self, response_id: str) -> None:
+        """The submission owning `response_id` is now streaming"""
+        entry = self._get_by_response(response_id)
+        if entry is not None and not entry._started.done():
+            entry._started.set_result(None)
+
+    def complete(self, response_id: str, message: Dict[str, Any], content: str) -> None:
+        """Record the stored answer of the submission owning `response_id`"""
+        entry = self._get_by_response(response_id)
+        if entry is None or not entry.running:
+            return
+        entry.message = message
+        entry.content = content
+        entry.expires_at = time.monotonic() + self.ttl
+        entry._done.set_result(message)
+
+    def discard(self, response_id: str) -> None:
+        """Forget an unfinished submission (failed or cancelled) so it can be retried"""
+        entry = self._get_by_response(response_id)
+        if entry is not None and entry.running:
+            self._remove(entry.key)
+
+
+idempotency_registry = IdempotencyRegistry(
+    ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+    max_entries=settings.IDEMPOTENCY_MAX_ENTRIES,
+)
@@ -0,0 +1,138 @@
+import asyncio
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+import httpx
+from botbrigade_llm import LLMClient
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import metrics
+from app.utils.background import spawn
+
+pool_clients = metrics.gauge(
+    "llm_client_pool_size", "Number of pooled LLM clients kept alive"
+)
+pool_requests = metrics.counter(
+    "llm_client_pool_requests_total",
+    "LLM client lookups by result (hit, miss)",
+    ["result"],
+)
+pool_evictions = metrics.counter(
+    "llm_client_pool_evictions_total", "LLM clients evicted from the pool"
+)
+
+
+class _PooledClient:
+    def __init__(self, client: LLMClient):
+        self.client = client
+        self.leases = 0
+        self.evicted = False
+
+
+class LLMClientPool:
+    """
+    Long-lived LLMClient instances keyed by project API key.
+
+    Each client keeps its httpx connections alive between chat messages. When
+    the pool is full the least recently used key is evicted (e.g. after a key
+    rotation); an evicted client is closed once no stream holds a lease on it.
+    """
+
+    _limits = httpx.Limits(
+        max_keepalive_connections=20,
+        max_connections=100,
+        keepalive_expiry=60.0,
+    )
+
+    def __init__(
+        self,
+        max_size: int = 100,
+        base_url: Optional[str] = None,
+        timeout: float = 60.0,
+    ):
+        self.max_size = max_size
+        self.base_url = base_url
+        self.timeout = timeout
+        self._clients: "OrderedDict[str, _PooledClient]" = OrderedDict()
+
+    def _create_client(self, api_key: str) -> LLMClient:
+        kwargs = {"api_key": api_key}
+        if self.base_url:
+            kwargs["base_url"] = self.base_url
+        client = LLMClient(**kwargs)
+        # The default httpx client drops idle connections after 5 seconds,
+        # which is shorter than the usual pause between two chat messages.
+        # LLMClient always opens it, so close it rather than leak it.
+        default_client = client.async_client
+        client.async_client = httpx.AsyncClient(
+            limits=self._limits, timeout=self.timeout
+        )
+        spawn(default_client.aclose())
+        return client
+
+    def _get_entry(self, api_key: str) -> _PooledClient:
+        entry = self._clients.get(api_key)
+        if entry is not None:
+            self._clients.move_to_end(api_key)
+            pool_requests.inc(result="hit")
+            return entry
+
+        pool_requests.inc(result="miss")
+        entry = _PooledClient(self._create_client(api_key))
+        self._clients[api_key] = entry
+        while len(self._clients) > self.max_size:
+            _, evicted = self._clients.popitem(last=False)
+            evicted.evicted = True
+            pool_evictions.inc()
+            if evicted.leases == 0:
+                spawn(self._close_client(evicted.client))
+        pool_clients.set(len(self._clients))
+        return entry
+
+    def get(self, api_key: str) -> LLMClient:
+        """Get the pooled client for a key, for short non-streaming calls"""
+        return self._get_entry(api_key).client
+
+    @asynccontextmanager
+    async def lease(self, api_key: str) -> AsyncIterator[LLMClient]:
+        """Hold a pooled client for the duration of a stream"""
+        entry = self._get_entry(api_key)
+        entry.leases += 1
+        try:
+            yield entry.client
+        finally:
+            entry.leases -= 1
+            if entry.evicted and entry.leases == 0:
+                spawn(self._close_client(entry.client))
+
+    async def _close_client(self, client: LLMClient) -> None:
+        try:
+            await client.aclose()
+            client.close()
+        except Exception as e:
+            logger.warning(f"Failed to close LLM client: {e}")
+
+    async def close(self) -> None:
+        """Close every pooled client"""
+        entries = list(self._clients.values())
+        self._clients.clear()
+        pool_clients.set(0)
+        await asyncio.gather(
+            *(self._close_client(entry.client) for entry in entries),
+            return_exceptions=True,
+        )
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+llm_client_pool = LLMClientPool(
+    max_size=settings.LLM_CLIENT_POOL_SIZE,
+    base_url=settings.LLM_BASE_URL,
+)
+
+
+# Function to close all LLM clients on application shutdown
+async def close_llm_clients():
+    """Close all pooled LLM clients to free resources"""
+    await llm_client_pool.close()
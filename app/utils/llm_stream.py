@@ -0,0 +1,33 @@
+import json
+from typing import Optional
+
+TEXT_PREFIX = '{"text":'
+
+
+def extract_text(chunk: str) -> Optional[str]:
+    """
+    Text of a `{"text": "..."}` stream chunk, or None for any other chunk
+    (usage, keep-alive, invalid JSON).
+
+    The gateway emits one text chunk per token, so the common case is handled
+    by slicing the string literal out of the chunk; only literals containing
+    escapes are decoded, and anything unexpected falls back to a full parse.
+    """
+    if chunk.startswith(TEXT_PREFIX) and chunk.endswith('"}'):
+        literal = chunk[len(TEXT_PREFIX) : -1].lstrip()
+        if len(literal) >= 2 and literal[0] == '"':
+            inner = literal[1:-1]
+            if "\\" not in inner and '"' not in inner:
+                return inner
+            try:
+                return json.loads(literal)
+            except json.JSONDecodeError:
+                pass
+
+    try:
+        data = json.loads(chunk)
+    except json.JSONDecodeError:
+        return None
+    if isinstance(data, dict) and isinstance(data.get("text"), str):
+        return data["text"]
+    return None
@@ -1,7 +1,11 @@
-from typing import TypeVar, Generic, Sequence
+import base64
+import json
+from typing import Any, List, TypeVar, Generic, Sequence, Tuple
 from fastapi import Query
 from pydantic import BaseModel
 from sqlalchemy.orm import Query as SQLAlchemyQuery
+from app.core.exceptions import APIError
+from app.utils.json_encoder import serialize_object
 
 T = TypeVar("T")
 
@@ -21,3 +25,24 @@ def paginate_query(query: SQLAlchemyQuery, params: PaginationParams) -> Paginate
     total = query.count()
     items = query.offset((params.page - 1) * params.page_size).limit(params.page_size).all()
     return PaginatedResult(items=items, total=total, params=params)
+
+def encode_cursor(order: Sequence[str], values: Sequence[Any], backward: bool = False) -> str:
+    """Opaque keyset cursor: the sort values of a row and the paging direction"""
+    payload = json.dumps(
+        {"o": list(order), "v": list(values), "b": backward},
+        default=serialize_object,
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, order: Sequence[str]) -> Tuple[List[Any], bool]:
+    """Sort values and direction of a cursor issued for the same ordering"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        values, backward = payload["v"], bool(payload["b"])
+        valid = payload["o"] == list(order) and len(values) == len(order)
+    except (ValueError, KeyError, TypeError):
+        valid = False
+    if not valid:
+        raise APIError(message="Invalid cursor", status_code=400)
+    return values, backward
@@ -0,0 +1,109 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import metrics
+from app.utils.background import spawn
+
+prefetch_requests = metrics.counter(
+    "chat_prefetch_requests_total",
+    "Prefetch lookups by the message POST, by result (hit, inflight, miss)",
+    ["result"],
+)
+prefetch_evictions = metrics.counter(
+    "chat_prefetch_evictions_total",
+    "Prefetched entries dropped unused, by reason (expired, memory)",
+    ["reason"],
+)
+prefetch_bytes = metrics.gauge(
+    "chat_prefetch_bytes", "Estimated memory held by prefetched entries"
+)
+
+
+class PrefetchCache:
+    """
+    Short-lived, single-use results of background loads, bounded by TTL and
+    an estimated byte budget per worker.
+
+    `schedule` starts a load unless one is fresh or already running for the
+    key; `take` hands the result to exactly one consumer, waiting for a load
+    that is still in flight.
+    """
+
+    def __init__(self, ttl: float = 15.0, max_bytes: int = 16 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._bytes = 0
+
+    def _pop(self, key: Hashable) -> Optional[Tuple[float, int, Any]]:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+            prefetch_bytes.set(self._bytes)
+        return entry
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, e in self._entries.items() if e[0] < now]:
+            self._pop(key)
+            prefetch_evictions.inc(reason="expired")
+        while self._bytes > self.max_bytes and self._entries:
+            self._pop(next(iter(self._entries)))
+            prefetch_evictions.inc(reason="memory")
+
+    def schedule(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        size: Callable[[Any], int],
+    ) -> None:
+        self._prune()
+        if key in self._entries or key in self._inflight:
+            return
+        task = spawn(self._load(key, loader, size), name=f"prefetch-{hash(key)}")
+        self._inflight[key] = task
+
+    async def _load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        size: Callable[[Any], int],
+    ) -> Any:
+        try:
+            value = await loader()
+        except Exception as e:
+            # A failed warm-up only means the POST loads everything itself
+            logger.warning(f"Prefetch failed: {e}")
+            return None
+        finally:
+            self._inflight.pop(key, None)
+
+        nbytes = size(value)
+        if nbytes <= self.max_bytes:
+            self._entries[key] = (time.monotonic() + self.ttl, nbytes, value)
+            self._bytes += nbytes
+            self._prune()
+            prefetch_bytes.set(self._bytes)
+        return value
+
+    async def take(self, key: Hashable) -> Optional[Any]:
+        task = self._inflight.get(key)
+        if task is not None:
+            prefetch_requests.inc(result="inflight")
+            value = await asyncio.shield(task)
+            self._pop(key)
+            return value
+
+        self._prune()
+        entry = self._pop(key)
+        prefetch_requests.inc(result="hit" if entry else "miss")
+        return entry[2] if entry else None
+
+
+prefetch_cache = PrefetchCache(
+    ttl=settings.PREFETCH_TTL_SECONDS, max_bytes=settings.PREFETCH_MAX_BYTES
+)
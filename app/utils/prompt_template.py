@@ -0,0 +1,86 @@
+import re
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+VARIABLE_PATTERN = re.compile(r"{{(\w+)}}")
+
+
+class CompiledTemplate:
+    """
+    A prompt template split once into literal and variable segments.
+
+    `segments` alternates literal text (even indices) and variable names (odd
+    indices), so rendering is a single join without any regex work.
+    """
+
+    __slots__ = ("segments", "variables")
+
+    def __init__(self, segments: Tuple[str, ...]):
+        self.segments = segments
+        self.variables = tuple(dict.fromkeys(segments[1::2]))
+
+    def render(self, values: Dict[str, Any]) -> str:
+        if len(self.segments) == 1:
+            return self.segments[0]
+        parts = list(self.segments)
+        for i in range(1, len(parts), 2):
+            parts[i] = format_variable_value(values.get(parts[i]))
+        return "".join(parts)
+
+
+def format_variable_value(value: Any) -> str:
+    """ConfigVariable values are stored as {"type": ..., "value": ...}"""
+    if isinstance(value, dict):
+        value = value.get("value")
+    if value is None:
+        return ""
+    return str(value)
+
+
+def compile_template(text: Optional[str]) -> CompiledTemplate:
+    # re.split with one capture group already alternates literal / variable
+    return CompiledTemplate(tuple(VARIABLE_PATTERN.split(text or "")))
+
+
+def variables_to_dict(variables: Iterable[Any]) -> Dict[str, Any]:
+    """Map ConfigVariable rows to their values by key"""
+    return {variable.key: variable.value for variable in variables}
+
+
+class TemplateCache:
+    """LRU of compiled templates keyed by (config_id, version, updated_at)"""
+
+    def __init__(self, max_size: int = 512):
+        self.max_size = max_size
+        self._templates: "OrderedDict[Hashable, CompiledTemplate]" = OrderedDict()
+
+    def get(self, key: Hashable, text: Optional[str]) -> CompiledTemplate:
+        template = self._templates.get(key)
+        if template is not None:
+            self._templates.move_to_end(key)
+            return template
+
+        template = compile_template(text)
+        self._templates[key] = template
+        if len(self._templates) > self.max_size:
+            self._templates.popitem(last=False)
+        return template
+
+    def clear(self) -> None:
+        self._templates.clear()
+
+
+template_cache = TemplateCache()
+
+
+def render_custom_instructions(
+    config: Any, variables: Optional[List[Any]] = None
+) -> Optional[str]:
+    """Render a BotConfig's custom_instructions with its ConfigVariable values"""
+    if not config.custom_instructions:
+        return config.custom_instructions
+
+    template = template_cache.get(
+        (config.id, config.version, config.updated_at), config.custom_instructions
+    )
+    return template.render(variables_to_dict(variables or []))
@@ -0,0 +1,102 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.metrics import metrics
+
+cache_requests = metrics.counter(
+    "chat_response_cache_requests_total",
+    "Response cache lookups by bot and result (hit, miss)",
+    ["bot_id", "result"],
+)
+cache_hit_ratio = metrics.gauge(
+    "chat_response_cache_hit_ratio",
+    "Share of response cache lookups served from the cache",
+    ["bot_id"],
+)
+cache_entries = metrics.gauge(
+    "chat_response_cache_entries", "Number of cached chat responses"
+)
+cache_evictions = metrics.counter(
+    "chat_response_cache_evictions_total",
+    "Cached chat responses dropped by reason (expired, size)",
+    ["reason"],
+)
+
+
+def _normalize(content: str) -> str:
+    return " ".join((content or "").split())
+
+
+def build_cache_key(
+    model: str,
+    sampling: Dict[str, Any],
+    messages: List[Dict[str, str]],
+) -> str:
+    """
+    Hash of everything that determines a deterministic completion: model,
+    sampling parameters, system prompt and whitespace-normalized history.
+    """
+    payload = {
+        "model": model,
+        "sampling": sampling,
+        "messages": [
+            [message["role"], _normalize(message["content"])] for message in messages
+        ],
+    }
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """In-process TTL cache of final assistant answers, bounded in entries"""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lookups: Dict[str, List[int]] = {}
+
+    def _record(self, bot_id: str, hit: bool) -> None:
+        cache_requests.inc(bot_id=bot_id, result="hit" if hit else "miss")
+        hits, total = self._lookups.get(bot_id, [0, 0])
+        hits, total = hits + int(hit), total + 1
+        self._lookups[bot_id] = [hits, total]
+        cache_hit_ratio.set(hits / total, bot_id=bot_id)
+
+    def get(self, key: str, bot_id: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] < time.monotonic():
+            del self._entries[key]
+            cache_evictions.inc(reason="expired")
+            cache_entries.set(len(self._entries))
+            entry = None
+
+        self._record(bot_id, hit=entry is not None)
+        if entry is None:
+            return None
+
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: str, content: str) -> None:
+        if not content:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, content)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            cache_evictions.inc(reason="size")
+        cache_entries.set(len(self._entries))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        cache_entries.set(0)
+
+
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    ttl=settings.RESPONSE_CACHE_TTL,
+)
@@ -0,0 +1,40 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+from uuid import UUID
+from app.core.metrics import metrics
+
+stage_seconds = metrics.histogram(
+    "chat_stage_seconds",
+    "Duration of each chat pipeline stage, per bot and model",
+    ["stage", "bot_id", "model"],
+)
+
+
+class StageTimer:
+    """Monotonic timings of the pipeline stages of one chat request"""
+
+    def __init__(self, bot_id: UUID, model: str):
+        self.labels = {"bot_id": str(bot_id), "model": model}
+        self.started_at = time.monotonic()
+        self.stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the block; stages that raise are not recorded"""
+        start = time.monotonic()
+        yield
+        self.record(name, time.monotonic() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+        stage_seconds.observe(seconds, stage=name, **self.labels)
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def server_timing(self) -> str:
+        """Stages recorded so far as a Server-Timing header value"""
+        return ", ".join(
+            f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.stages.items()
+        )
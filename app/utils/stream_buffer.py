@@ -0,0 +1,213 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict, deque
+from typing import Any, AsyncGenerator, Deque, Hashable, Optional, Tuple
+from app.core.config import settings
+from app.core.exceptions import APIError
+from app.core.logging import logger
+from app.core.metrics import metrics
+from app.utils.background import spawn
+
+buffered_streams = metrics.gauge(
+    "chat_stream_buffers", "Chat streams kept in memory for resumption"
+)
+resumed_streams = metrics.counter(
+    "chat_stream_resumed_total",
+    "Reconnects attached to a buffered stream, by result (live, tail, gap)",
+    ["result"],
+)
+
+
+class StreamBuffer:
+    """Bounded ring buffer of the SSE events of one generation"""
+
+    def __init__(self, key: str, owner: Hashable, max_events: int):
+        self.key = key
+        self.owner = owner
+        self.events: Deque[Tuple[int, str]] = deque(maxlen=max_events)
+        self.next_id = 0
+        self.done = False
+        self.completed_at: Optional[float] = None
+        self.subscribers = 0
+        self.producer: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+        self._grace_handle: Optional[asyncio.TimerHandle] = None
+
+    def append(self, data: str) -> None:
+        self.events.append((self.next_id, data))
+        self.next_id += 1
+        self._notify()
+
+    def close(self) -> None:
+        self.done = True
+        self.completed_at = time.monotonic()
+        self._notify()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def since(self, cursor: int) -> list:
+        """Events with id >= cursor that are still buffered"""
+        count = min(self.next_id - max(cursor, 0), len(self.events))
+        # Index from the right: live subscribers only need the newest events
+        return [self.events[-i] for i in range(count, 0, -1)]
+
+
+class StreamBroker:
+    """
+    Runs each generation in a detached producer task that writes its events
+    into a ring buffer keyed by the assistant message id. SSE responses are
+    subscribers of that buffer, so a client that reconnects with
+    Last-Event-ID continues the running generation (or replays its tail)
+    instead of starting a new one.
+
+    When the last subscriber leaves an unfinished stream, the producer is
+    cancelled after `grace` seconds unless someone reattaches. Finished
+    buffers are evicted `retention` seconds after completion.
+    """
+
+    def __init__(
+        self,
+        max_events: int = 2048,
+        max_streams: int = 1000,
+        retention: float = 60.0,
+        grace: float = 10.0,
+    ):
+        self.max_events = max_events
+        self.max_streams = max_streams
+        self.retention = retention
+        self.grace = grace
+        self._buffers: "OrderedDict[str, StreamBuffer]" = OrderedDict()
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        for key in [
+            key
+            for key, buffer in self._buffers.items()
+            if buffer.done and now - buffer.completed_at > self.retention
+        ]:
+            del self._buffers[key]
+
+        # Over capacity: drop the oldest finished streams first
+        if len(self._buffers) > self.max_streams:
+            for key in [key for key, buffer in self._buffers.items() if buffer.done]:
+                if len(self._buffers) <= self.max_streams:
+                    break
+                del self._buffers[key]
+        buffered_streams.set(len(self._buffers))
+
+    def get(self, key: str, owner: Hashable) -> Optional[StreamBuffer]:
+        self._prune()
+        buffer = self._buffers.get(key)
+        if buffer is None or buffer.owner != owner:
+            return None
+        return buffer
+
+    def exists(self, key: str) -> bool:
+        """Whether any owner has a buffered stream under `key`"""
+        self._prune()
+        return key in self._buffers
+
+    def start(
+        self,
+        key: str,
+        owner: Hashable,
+        generator: AsyncGenerator[Any, None],
+    ) -> AsyncGenerator[dict, None]:
+        """Start producing `generator` into a new buffer and subscribe to it"""
+        self._prune()
+        if key in self._buffers:
+            raise APIError(status_code=409, message="Response is already streaming")
+
+        buffer = StreamBuffer(key, owner, self.max_events)
+        self._buffers[key] = buffer
+        buffered_streams.set(len(self._buffers))
+        buffer.producer = spawn(
+            self._produce(buffer, generator), name=f"stream-producer-{key}"
+        )
+        return self._subscribe(buffer, cursor=0)
+
+    def resume(
+        self, key: str, owner: Hashable, last_event_id: Optional[str]
+    ) -> AsyncGenerator[dict, None]:
+        """Subscribe to a buffered stream after the event `last_event_id`"""
+        buffer = self.get(key, owner)
+        if buffer is None:
+            raise APIError(status_code=404, message="Stream not found or expired")
+
+        cursor = parse_event_id(last_event_id) + 1
+        if buffer.events and cursor < buffer.events[0][0]:
+            resumed_streams.inc(result="gap")
+        else:
+            resumed_streams.inc(result="tail" if buffer.done else "live")
+        return self._subscribe(buffer, cursor=cursor)
+
+    async def _produce(
+        self, buffer: StreamBuffer, generator: AsyncGenerator[Any, None]
+    ) -> None:
+        try:
+            async for chunk in generator:
+                buffer.append(chunk if isinstance(chunk, str) else json.dumps(chunk))
+        except asyncio.CancelledError:
+            # Nobody reattached in time: closing the generator cancels the
+            # upstream LLM stream and stores the partial answer.
+            await generator.aclose()
+        except Exception as e:
+            logger.error(f"Stream {buffer.key} failed: {e}")
+            buffer.append(json.dumps({"error": str(e)}))
+        finally:
+            buffer.close()
+
+    async def _subscribe(
+        self, buffer: StreamBuffer, cursor: int
+    ) -> AsyncGenerator[dict, None]:
+        self._attach(buffer)
+        try:
+            while True:
+                changed = buffer._changed
+                for event_id, data in buffer.since(cursor):
+                    yield {"id": str(event_id), "data": data}
+                    cursor = event_id + 1
+                if buffer.done and cursor >= buffer.next_id:
+                    return
+                if cursor >= buffer.next_id:
+                    await changed.wait()
+        finally:
+            self._detach(buffer)
+
+    def _attach(self, buffer: StreamBuffer) -> None:
+        buffer.subscribers += 1
+        if buffer._grace_handle is not None:
+            buffer._grace_handle.cancel()
+            buffer._grace_handle = None
+
+    def _detach(self, buffer: StreamBuffer) -> None:
+        buffer.subscribers -= 1
+        if buffer.subscribers or buffer.done:
+            return
+        buffer._grace_handle = asyncio.get_running_loop().call_later(
+            self.grace, self._abandon, buffer
+        )
+
+    def _abandon(self, buffer: StreamBuffer) -> None:
+        buffer._grace_handle = None
+        if not buffer.subscribers and not buffer.done and buffer.producer:
+            buffer.producer.cancel()
+
+
+def parse_event_id(last_event_id: Optional[str]) -> int:
+    """Sequential event ids start at 0; missing or invalid means none seen"""
+    try:
+        return int(last_event_id)
+    except (TypeError, ValueError):
+        return -1
+
+
+stream_broker = StreamBroker(
+    max_events=settings.STREAM_BUFFER_MAX_EVENTS,
+    max_streams=settings.STREAM_BUFFER_MAX_STREAMS,
+    retention=settings.STREAM_BUFFER_RETENTION_SECONDS,
+    grace=settings.STREAM_RESUME_GRACE_SECONDS,
+)
@@ -0,0 +1,233 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+from app.core.config import settings
+from app.core.exceptions import APIError
+from app.core.metrics import metrics
+
+queue_depth = metrics.gauge(
+    "chat_stream_queue_depth",
+    "Chat streams waiting for a slot, per tenant",
+    ["tenant_id"],
+)
+queue_wait_seconds = metrics.histogram(
+    "chat_stream_queue_wait_seconds",
+    "Time spent waiting for a chat stream slot, per tenant",
+    ["tenant_id"],
+)
+active_streams = metrics.gauge(
+    "chat_stream_active", "Chat streams currently running, per tenant", ["tenant_id"]
+)
+rejected_streams = metrics.counter(
+    "chat_stream_rejected_total",
+    "Chat streams rejected with 429, per tenant and reason (queue_full, timeout)",
+    ["tenant_id", "reason"],
+)
+
+ANONYMOUS = "anonymous"
+
+
+class StreamLease:
+    """A granted stream slot; release() is idempotent"""
+
+    __slots__ = ("scheduler", "tenant_id", "project_id", "granted_at", "released")
+
+    def __init__(self, scheduler: "StreamScheduler", tenant_id: str, project_id: str):
+        self.scheduler = scheduler
+        self.tenant_id = tenant_id
+        self.project_id = project_id
+        self.granted_at = time.monotonic()
+        self.released = False
+
+    def release(self) -> None:
+        if not self.released:
+            self.released = True
+            self.scheduler._release(self)
+
+    async def __aenter__(self) -> "StreamLease":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
+
+
+class _Waiter:
+    __slots__ = ("tenant_id", "project_id", "future", "enqueued_at")
+
+    def __init__(self, tenant_id: str, project_id: str):
+        self.tenant_id = tenant_id
+        self.project_id = project_id
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.enqueued_at = time.monotonic()
+
+
+class StreamScheduler:
+    """
+    Admission control for LLM streams.
+
+    Streams run under a global, per-tenant and per-project concurrency cap.
+    Requests over the cap wait in per-tenant queues that are served by
+    weighted fair queuing (lowest virtual time first), so a tenant with a
+    bulk script cannot starve the others. Waiting is bounded: a full queue
+    or a wait past `max_wait` fails fast with 429 and a Retry-After hint.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 200,
+        max_per_tenant: int = 20,
+        max_per_project: int = 10,
+        max_queue_per_tenant: int = 50,
+        max_wait: float = 10.0,
+        tenant_weights: Optional[Dict[str, float]] = None,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_per_tenant = max_per_tenant
+        self.max_per_project = max_per_project
+        self.max_queue_per_tenant = max_queue_per_tenant
+        self.max_wait = max_wait
+        self.tenant_weights = tenant_weights or {}
+
+        self._active_total = 0
+        self._active_tenant: Dict[str, int] = {}
+        self._active_project: Dict[str, int] = {}
+        self._queues: Dict[str, Deque[_Waiter]] = {}
+        self._vtime: Dict[str, float] = {}
+        self._last_vtime = 0.0
+        # Moving average of stream duration, used for Retry-After
+        self._avg_duration = 0.0
+
+    def _has_capacity(self, tenant_id: str, project_id: str) -> bool:
+        return (
+            self._active_total < self.max_concurrent
+            and self._active_tenant.get(tenant_id, 0) < self.max_per_tenant
+            and self._active_project.get(project_id, 0) < self.max_per_project
+        )
+
+    def _grant(self, tenant_id: str, project_id: str) -> StreamLease:
+        self._active_total += 1
+        self._active_tenant[tenant_id] = self._active_tenant.get(tenant_id, 0) + 1
+        self._active_project[project_id] = self._active_project.get(project_id, 0) + 1
+        active_streams.set(self._active_tenant[tenant_id], tenant_id=tenant_id)
+
+        # Each grant costs 1/weight of virtual time
+        weight = self.tenant_weights.get(tenant_id, 1.0)
+        vtime = max(self._vtime.get(tenant_id, 0.0), self._last_vtime)
+        self._vtime[tenant_id] = vtime + 1.0 / weight
+        self._last_vtime = vtime
+        return StreamLease(self, tenant_id, project_id)
+
+    def _release(self, lease: StreamLease) -> None:
+        self._active_total -= 1
+        self._active_tenant[lease.tenant_id] -= 1
+        self._active_project[lease.project_id] -= 1
+        active_streams.set(
+            self._active_tenant[lease.tenant_id], tenant_id=lease.tenant_id
+        )
+        if not self._active_tenant[lease.tenant_id]:
+            del self._active_tenant[lease.tenant_id]
+        if not self._active_project[lease.project_id]:
+            del self._active_project[lease.project_id]
+
+        duration = time.monotonic() - lease.granted_at
+        self._avg_duration = (
+            duration
+            if not self._avg_duration
+            else 0.9 * self._avg_duration + 0.1 * duration
+        )
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Hand freed slots to waiting tenants in weighted fair order"""
+        while self._active_total < self.max_concurrent:
+            candidates = [
+                tenant_id
+                for tenant_id, queue in self._queues.items()
+                if queue and self._has_capacity(tenant_id, queue[0].project_id)
+            ]
+            if not candidates:
+                return
+
+            tenant_id = min(
+                candidates,
+                key=lambda t: max(self._vtime.get(t, 0.0), self._last_vtime),
+            )
+            waiter = self._queues[tenant_id].popleft()
+            self._update_queue_depth(tenant_id)
+            waiter.future.set_result(self._grant(tenant_id, waiter.project_id))
+
+    def _update_queue_depth(self, tenant_id: str) -> None:
+        queue = self._queues.get(tenant_id)
+        queue_depth.set(len(queue) if queue else 0, tenant_id=tenant_id)
+        if queue is not None and not queue:
+            del self._queues[tenant_id]
+
+    def _remove_waiter(self, waiter: _Waiter) -> None:
+        queue = self._queues.get(waiter.tenant_id)
+        if queue and waiter in queue:
+            queue.remove(waiter)
+            self._update_queue_depth(waiter.tenant_id)
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait before retrying"""
+        return max(1, min(60, math.ceil(self._avg_duration or self.max_wait)))
+
+    def _reject(self, tenant_id: str, reason: str) -> APIError:
+        rejected_streams.inc(tenant_id=tenant_id, reason=reason)
+        return APIError(
+            status_code=429,
+            message="Too many concurrent chat streams, please retry later",
+            headers={"Retry-After": str(self.retry_after())},
+        )
+
+    async def acquire(
+        self, tenant_id: Optional[str], project_id: Optional[str]
+    ) -> StreamLease:
+        tenant_id = tenant_id or ANONYMOUS
+        project_id = project_id or ANONYMOUS
+
+        if not self._queues.get(tenant_id) and self._has_capacity(
+            tenant_id, project_id
+        ):
+            queue_wait_seconds.observe(0.0, tenant_id=tenant_id)
+            return self._grant(tenant_id, project_id)
+
+        queue = self._queues.setdefault(tenant_id, deque())
+        if len(queue) >= self.max_queue_per_tenant:
+            raise self._reject(tenant_id, "queue_full")
+
+        waiter = _Waiter(tenant_id, project_id)
+        queue.append(waiter)
+        self._update_queue_depth(tenant_id)
+
+        try:
+            await asyncio.wait({waiter.future}, timeout=self.max_wait)
+        except asyncio.CancelledError:
+            # Client went away while queued; hand back a slot granted meanwhile
+            if waiter.future.done():
+                waiter.future.result().release()
+            else:
+                self._remove_waiter(waiter)
+            raise
+
+        queue_wait_seconds.observe(
+            time.monotonic() - waiter.enqueued_at, tenant_id=tenant_id
+        )
+        if waiter.future.done():
+            return waiter.future.result()
+
+        self._remove_waiter(waiter)
+        waiter.future.cancel()
+        raise self._reject(tenant_id, "timeout")
+
+
+stream_scheduler = StreamScheduler(
+    max_concurrent=settings.STREAM_MAX_CONCURRENT,
+    max_per_tenant=settings.STREAM_MAX_PER_TENANT,
+    max_per_project=settings.STREAM_MAX_PER_PROJECT,
+    max_queue_per_tenant=settings.STREAM_MAX_QUEUE_PER_TENANT,
+    max_wait=settings.STREAM_MAX_WAIT_SECONDS,
+    tenant_weights=settings.STREAM_TENANT_WEIGHTS,
+)
@@ -0,0 +1,16 @@
+from typing import Dict, List
+
+# Rough characters-per-token ratio for English text on BPE tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate that avoids running a tokenizer on the hot path"""
+    if not text:
+        return 0
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def estimate_messages_tokens(messages: List[Dict[str, str]]) -> int:
+    """Estimate the prompt size of a list of chat messages"""
+    return sum(estimate_tokens(message.get("content") or "") for message in messages)
@@ -0,0 +1,128 @@
+# scripts/benchmarks/bot_name_search.py
+import asyncio
+import statistics
+import time
+from uuid import uuid4
+import typer
+from dotenv import load_dotenv
+
+# Load .env file first
+load_dotenv()
+
+# Then import the rest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from app.core.config import settings
+from app.core.repository import BaseRepository
+from app.models.base import current_tenant_id
+from app.models.bot import Bot
+from app.models.enums import CountModeEnum
+
+app = typer.Typer()
+
+WORDS = [
+    "writing",
+    "essay",
+    "academic",
+    "research",
+    "coding",
+    "python",
+    "tutor",
+    "math",
+    "travel",
+    "planner",
+    "recipe",
+    "fitness",
+    "legal",
+    "contract",
+    "marketing",
+    "copy",
+    "support",
+    "assistant",
+    "helper",
+    "translator",
+]
+
+# Three words and a number per name, e.g. "essay tutor planner 4821"
+SYNTHETIC_BOTS = text("""
+    INSERT INTO bots (id, tenant_id, name, status, created_at)
+    SELECT gen_random_uuid(), CAST(:tenant_id AS uuid),
+           w[1 + i % 20] || ' ' || w[1 + (i / 20) % 20] || ' '
+           || w[1 + (i / 400) % 20] || ' ' || i,
+           'ACTIVE', now() - i * interval '1 second'
+    FROM generate_series(1, :rows) AS i, (SELECT CAST(:words AS text[]) AS w) AS words
+    """)
+
+SEARCHES = {
+    "contains 'tutor plan'": ("contains", "tutor plan"),
+    "trigram 'tutor plan'": ("trigram", "tutor plan"),
+    "trigram typo 'esay helpr'": ("trigram", "esay helpr"),
+}
+
+
+@app.command()
+def run(rows: int = 1_000_000, iterations: int = 10, url: str = settings.DATABASE_URL):
+    """
+    First page of bot name searches over `rows` synthetic bots of one tenant,
+    without and with the ix_bots_name_trgm index. Runs in a transaction that
+    is rolled back, but dropping the index locks `bots` meanwhile: use a
+    development database with pg_trgm installed.
+    """
+
+    async def benchmark():
+        engine = create_async_engine(url)
+        tenant_id = str(uuid4())
+        current_tenant_id.set(tenant_id)
+
+        async with engine.connect() as conn:
+            await conn.begin()
+            start = time.perf_counter()
+            await conn.execute(
+                SYNTHETIC_BOTS, {"tenant_id": tenant_id, "rows": rows, "words": WORDS}
+            )
+            await conn.execute(text("ANALYZE bots"))
+            typer.echo(f"inserted {rows} bots in {time.perf_counter() - start:.1f}s")
+
+            repo = BaseRepository(Bot, AsyncSession(bind=conn))
+
+            async def measure(label: str):
+                for search, (search_type, term) in SEARCHES.items():
+                    timings = []
+                    for _ in range(iterations):
+                        start = time.perf_counter()
+                        page = await repo.get_multi(
+                            limit=10,
+                            search_fields={"name": search_type},
+                            search_term=term,
+                            order_by=["-created_at"],
+                            is_tenant_scoped=True,
+                            count_mode=CountModeEnum.NONE,
+                        )
+                        timings.append((time.perf_counter() - start) * 1000)
+                    typer.echo(
+                        f"{label:<10} {search:<26} "
+                        f"median={statistics.median(timings):8.2f}ms "
+                        f"first={page.items[0].name if page.items else '-'}"
+                    )
+
+            await conn.execute(text("DROP INDEX IF EXISTS ix_bots_name_trgm"))
+            await measure("no index")
+            await conn.execute(
+                text(
+                    "CREATE INDEX ix_bots_name_trgm ON bots "
+                    "USING gin (name gin_trgm_ops)"
+                )
+            )
+            await conn.execute(text("ANALYZE bots"))
+            await measure("trgm gin")
+            await conn.rollback()
+        await engine.dispose()
+
+    asyncio.run(benchmark())
+
+
+if __name__ == "__main__":
+    app()
+
+
+# poetry run python -m scripts.benchmarks.bot_name_search --rows 1000000
@@ -0,0 +1,79 @@
+# scripts/benchmarks/llm_client_pool.py
+import asyncio
+import statistics
+import time
+import typer
+from dotenv import load_dotenv
+
+# Load .env file first
+load_dotenv()
+
+# Then import the rest
+from botbrigade_llm import LLMClient
+from app.utils.llm_client_pool import LLMClientPool
+from scripts.benchmarks.llm_stub import start_stub, stop_stub
+
+app = typer.Typer()
+
+MESSAGES = [{"role": "user", "content": "Hello"}]
+
+
+async def _ttft(client: LLMClient) -> float:
+    """Seconds from request to the first streamed chunk, draining the rest"""
+    start = time.perf_counter()
+    ttft = None
+    async for _ in await client.responses.acreate(
+        model="claudia-1", messages=MESSAGES, stream=True
+    ):
+        if ttft is None:
+            ttft = time.perf_counter() - start
+    return ttft
+
+
+def _report(label: str, samples: list) -> None:
+    samples_ms = sorted(sample * 1000 for sample in samples)
+    p95 = samples_ms[int(len(samples_ms) * 0.95) - 1]
+    typer.echo(
+        f"{label:<10} mean={statistics.mean(samples_ms):.2f}ms "
+        f"p50={statistics.median(samples_ms):.2f}ms p95={p95:.2f}ms"
+    )
+
+
+@app.command()
+def run(requests: int = 200, warmup: int = 10):
+    """Compare TTFT of a fresh LLMClient per message against the pooled client"""
+
+    async def benchmark():
+        server, task, base_url = await start_stub()
+        try:
+            unpooled = []
+            for i in range(warmup + requests):
+                client = LLMClient(api_key="bench", base_url=base_url)
+                ttft = await _ttft(client)
+                await client.aclose()
+                client.close()
+                if i >= warmup:
+                    unpooled.append(ttft)
+
+            pool = LLMClientPool(max_size=4, base_url=base_url)
+            pooled = []
+            for i in range(warmup + requests):
+                async with pool.lease("bench") as client:
+                    ttft = await _ttft(client)
+                if i >= warmup:
+                    pooled.append(ttft)
+            await pool.close()
+
+            _report("unpooled", unpooled)
+            _report("pooled", pooled)
+        finally:
+            await stop_stub(server, task)
+
+    asyncio.run(benchmark())
+
+
+if __name__ == "__main__":
+    app()
+
+
+# poetry run python -m scripts.benchmarks.llm_client_pool --requests 200
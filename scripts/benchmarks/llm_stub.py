@@ -0,0 +1,68 @@
+# scripts/benchmarks/llm_stub.py
+import asyncio
+import json
+import socket
+from typing import Optional, Tuple
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+
+def create_stub_app(
+    tokens: int = 20, token_delay: float = 0.0, first_token_delay: float = 0.0
+) -> Starlette:
+    """Minimal stand-in for the LLM gateway `/completion` endpoint"""
+
+    async def completion(request: Request):
+        payload = await request.json()
+        words = [f"token{i} " for i in range(tokens)]
+
+        if not payload.get("stream"):
+            await asyncio.sleep(first_token_delay + token_delay * tokens)
+            return JSONResponse(
+                {
+                    "choices": [
+                        {"message": {"role": "assistant", "content": "".join(words)}}
+                    ]
+                }
+            )
+
+        async def events():
+            await asyncio.sleep(first_token_delay)
+            for word in words:
+                yield f"data: {json.dumps({'text': word})}\n\n"
+                if token_delay:
+                    await asyncio.sleep(token_delay)
+            yield f"data: {json.dumps({'usage': {'output_tokens': tokens}})}\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return Starlette(routes=[Route("/completion", completion, methods=["POST"])])
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def start_stub(
+    port: Optional[int] = None, **kwargs
+) -> Tuple[uvicorn.Server, asyncio.Task, str]:
+    """Start the stub in the running event loop, returns (server, task, base_url)"""
+    port = port or _free_port()
+    config = uvicorn.Config(
+        create_stub_app(**kwargs), host="127.0.0.1", port=port, log_level="error"
+    )
+    server = uvicorn.Server(config)
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    return server, task, f"http://127.0.0.1:{port}"
+
+
+async def stop_stub(server: uvicorn.Server, task: asyncio.Task) -> None:
+    server.should_exit = True
+    await task
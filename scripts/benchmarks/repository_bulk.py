@@ -0,0 +1,94 @@
+# scripts/benchmarks/repository_bulk.py
+import asyncio
+import time
+import typer
+from dotenv import load_dotenv
+
+# Load .env file first
+load_dotenv()
+
+# Then import the rest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from app.core.config import settings
+from app.core.repository import BaseRepository
+from app.models.master import MstCategory
+
+app = typer.Typer()
+
+
+def _rows(prefix: str, count: int) -> list:
+    return [{"name": f"{prefix}-{i}", "slug": f"{prefix}-{i}"} for i in range(count)]
+
+
+@app.command()
+def run(rows: int = 100, url: str = settings.DATABASE_URL):
+    """
+    Round trips and wall time to write `rows` master categories one by one
+    and with the bulk repository methods. Runs in a transaction that is
+    rolled back; upsert_many needs PostgreSQL.
+    """
+
+    async def benchmark():
+        engine = create_async_engine(url)
+        statements = []
+        event.listen(
+            engine.sync_engine,
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+
+        if engine.dialect.name == "sqlite":
+            async with engine.begin() as conn:
+                await conn.run_sync(MstCategory.__table__.create)
+
+        async with engine.connect() as conn:
+            await conn.begin()
+            repo = BaseRepository(MstCategory, AsyncSession(bind=conn))
+
+            async def measure(label: str, write) -> list:
+                statements.clear()
+                start = time.perf_counter()
+                result = await write()
+                elapsed = (time.perf_counter() - start) * 1000
+                typer.echo(
+                    f"{label:<18} round_trips={len(statements):<5} "
+                    f"time={elapsed:8.2f}ms"
+                )
+                return result
+
+            async def create_each():
+                return [await repo.create(row) for row in _rows("single", rows)]
+
+            async def update_each():
+                for obj in singles:
+                    await repo.update(obj.id, {"name": f"{obj.name}-updated"})
+
+            singles = await measure("create x N", create_each)
+            await measure("create_many", lambda: repo.create_many(_rows("bulk", rows)))
+            await measure("update x N", update_each)
+            await measure(
+                "update_many",
+                lambda: repo.update_many(
+                    [{"id": obj.id, "name": f"{obj.name}-bulk"} for obj in singles]
+                ),
+            )
+            if engine.dialect.name == "postgresql":
+                await measure(
+                    "upsert_many",
+                    lambda: repo.upsert_many(
+                        _rows("bulk", rows // 2) + _rows("upsert", rows // 2),
+                        index_elements=["slug"],
+                    ),
+                )
+            await conn.rollback()
+        await engine.dispose()
+
+    asyncio.run(benchmark())
+
+
+if __name__ == "__main__":
+    app()
+
+
+# poetry run python -m scripts.benchmarks.repository_bulk --rows 100
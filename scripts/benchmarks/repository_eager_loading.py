@@ -0,0 +1,129 @@
+# scripts/benchmarks/repository_eager_loading.py
+import asyncio
+import statistics
+import time
+from uuid import uuid4
+import typer
+from dotenv import load_dotenv
+
+# Load .env file first
+load_dotenv()
+
+# Then import the rest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from app.core.config import settings
+from app.core.repository import BaseRepository
+from app.models.bot import Bot, BotConfig, ConfigVariable, TeamBotAccess
+from app.models.master import MstCategory, MstItem
+
+app = typer.Typer()
+
+STRATEGIES = {
+    "joined (previous)": [
+        "configs:joined",
+        "configs.variables:joined",
+        "team_access:joined",
+        "category:joined",
+    ],
+    "defaults": ["configs.variables", "team_access", "category"],
+    "subquery": [
+        "configs:subquery",
+        "configs.variables:subquery",
+        "team_access:subquery",
+        "category",
+    ],
+}
+
+
+async def _heavy_bot(db: AsyncSession, configs: int, variables: int, teams: int):
+    bot = await BaseRepository(Bot, db).create({"name": "benchmark heavy bot"})
+    bot_configs = await BaseRepository(BotConfig, db).create_many(
+        [
+            {"bot_id": bot.id, "version": i + 1, "model_name": "claudia-1"}
+            for i in range(configs)
+        ]
+    )
+    await BaseRepository(ConfigVariable, db).create_many(
+        [
+            {"config_id": config.id, "key": f"var_{i}"}
+            for config in bot_configs
+            for i in range(variables)
+        ]
+    )
+    await BaseRepository(TeamBotAccess, db).create_many(
+        [{"bot_id": bot.id, "team_id": uuid4()} for _ in range(teams)]
+    )
+    return bot.id
+
+
+@app.command()
+def run(
+    configs: int = 10,
+    variables: int = 20,
+    teams: int = 15,
+    iterations: int = 20,
+    url: str = settings.DATABASE_URL,
+):
+    """
+    Load one synthetic bot with its configs, variables, team access and
+    category under each eager-loading strategy: statements, rows sent back
+    by the database and wall time. Runs in a transaction that is rolled back.
+    """
+
+    async def benchmark():
+        engine = create_async_engine(url)
+        statements = []
+        event.listen(
+            engine.sync_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, parameters, *args: statements.append(
+                (statement, parameters)
+            ),
+        )
+
+        if engine.dialect.name == "sqlite":
+            async with engine.begin() as conn:
+                for model in (MstCategory, MstItem, Bot, BotConfig):
+                    await conn.run_sync(model.__table__.create)
+                for model in (ConfigVariable, TeamBotAccess):
+                    await conn.run_sync(model.__table__.create)
+
+        async with engine.connect() as conn:
+            await conn.begin()
+            db = AsyncSession(bind=conn)
+            bot_id = await _heavy_bot(db, configs, variables, teams)
+            repo = BaseRepository(Bot, db)
+
+            for label, load_options in STRATEGIES.items():
+                timings = []
+                for _ in range(iterations):
+                    db.expunge_all()
+                    statements.clear()
+                    start = time.perf_counter()
+                    await repo.get(id=bot_id, load_options=load_options)
+                    timings.append((time.perf_counter() - start) * 1000)
+
+                # Rows each captured statement sends back
+                executed = list(statements)
+                rows = 0
+                for statement, parameters in executed:
+                    result = await conn.exec_driver_sql(
+                        f"SELECT count(*) FROM ({statement}) AS q", parameters
+                    )
+                    rows += result.scalar()
+                typer.echo(
+                    f"{label:<18} statements={len(executed):<3} rows={rows:<6} "
+                    f"median={statistics.median(timings):7.2f}ms"
+                )
+            await conn.rollback()
+        await engine.dispose()
+
+    asyncio.run(benchmark())
+
+
+if __name__ == "__main__":
+    app()
+
+
+# poetry run python -m scripts.benchmarks.repository_eager_loading --configs 10 --variables 20 --teams 15
@@ -0,0 +1,117 @@
+# scripts/benchmarks/repository_query.py
+import statistics
+import time
+from uuid import uuid4
+import typer
+from dotenv import load_dotenv
+
+# Load .env file first
+load_dotenv()
+
+# Then import the rest
+from sqlalchemy.dialects import postgresql
+from app.core.repository import query_plans
+from app.models.bot import Bot, BotConfig
+from app.repositories.bot_repository import BotConfigRepository, BotRepository
+
+app = typer.Typer()
+
+DIALECT = postgresql.asyncpg.dialect()
+
+
+def _query_shapes():
+    """
+    Statements get/get_multi run on every request, with fresh values, as
+    (statement, parameters) from the repository's plan cache
+    """
+    bot_repo = BotRepository(Bot, None)
+    config_repo = BotConfigRepository(BotConfig, None)
+    return {
+        "bot+configs.variables": lambda: bot_repo._query_plan(
+            filters={"id": uuid4()},
+            load_options=["configs.variables", "team_access"],
+        ),
+        "config+variables": lambda: config_repo._query_plan(
+            filters={"bot_id": uuid4(), "is_current": True},
+            load_options=["variables"],
+        ),
+        "bot list page": lambda: bot_repo._query_plan(
+            filters={"status": "ACTIVE", "category_id": [uuid4(), uuid4()]},
+            search_fields={"name": "contains", "tagline": "contains"},
+            search_term=uuid4().hex[:6],
+            order_by=["-created_at"],
+            is_tenant_scoped=True,
+            paginate=True,
+        ),
+        "bot list count": lambda: bot_repo._count_plan(
+            filters={"category_id": [uuid4()], "status": "ACTIVE"},
+            search_fields={"name": "contains", "tagline": "contains"},
+            search_term=uuid4().hex[:6],
+            is_tenant_scoped=True,
+        ),
+    }
+
+
+def _fresh(plan):
+    """
+    Baseline without plan caching: build a new select() on every call and
+    bind its values to it, as _build_query/_build_count_query used to
+    """
+
+    def build():
+        query_plans.clear()
+        stmt, params = plan()
+        return stmt.params(params) if params else stmt
+
+    return build
+
+
+def _cached(plan):
+    """The plan reused from the cache; its parameters go to execute()"""
+    return lambda: plan()[0]
+
+
+@app.command()
+def run(iterations: int = 5000):
+    """
+    Per-query Python overhead of BaseRepository: building the statement and
+    looking it up in a compiled-statement cache (compiling on a miss), the
+    way the engine does before each execute. Each shape is timed with a
+    freshly built statement per call (before plan caching) and with the
+    cached plan.
+    """
+    for label, plan in _query_shapes().items():
+        for mode, build in (("fresh", _fresh(plan)), ("cached", _cached(plan))):
+            _measure(f"{label} [{mode}]", build, iterations)
+
+
+def _measure(label: str, build, iterations: int) -> None:
+    compiled_cache = {}
+    misses = 0
+    build_us, lookup_us = [], []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        stmt = build()
+        built = time.perf_counter()
+
+        key = stmt._generate_cache_key().key
+        if key not in compiled_cache:
+            misses += 1
+            compiled_cache[key] = stmt.compile(dialect=DIALECT)
+        done = time.perf_counter()
+
+        build_us.append((built - start) * 1e6)
+        lookup_us.append((done - built) * 1e6)
+
+    typer.echo(
+        f"{label:<33} build={statistics.median(build_us):7.1f}us "
+        f"cache+compile={statistics.median(lookup_us):7.1f}us "
+        f"compiled {misses}x in {iterations}"
+    )
+
+
+if __name__ == "__main__":
+    app()
+
+
+# poetry run python -m scripts.benchmarks.repository_query --iterations 5000